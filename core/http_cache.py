@@ -0,0 +1,87 @@
+"""
+HTTP Response Cache
+Shares responses to identical probes across vulnerability tests
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import requests
+
+
+class CachedSession:
+    """
+    Wraps a requests.Session with an LRU cache of responses.
+
+    Several tests issue the same baseline request (e.g. an unauthenticated GET
+    of the target); with a shared cache only the first one reaches the server.
+    Exposes the get/post/request API the tests already use.
+    """
+
+    CACHEABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(self, session: requests.Session, maxsize: int = 2048,
+                 cache_idempotent_only: bool = True):
+        self.uncached = session
+        self.maxsize = maxsize
+        self.cache_idempotent_only = cache_idempotent_only
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple, requests.Response]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(method: str, url: str, kwargs: Dict[str, Any]) -> Tuple:
+        headers = kwargs.get("headers") or {}
+        params = kwargs.get("params") or {}
+        cookies = kwargs.get("cookies") or {}
+        body = json.dumps([kwargs.get("json"), kwargs.get("data")], sort_keys=True, default=str)
+        return (
+            method,
+            url,
+            frozenset(headers.items()),
+            frozenset(params.items()) if isinstance(params, dict) else str(params),
+            frozenset(cookies.items()) if isinstance(cookies, dict) else str(cookies),
+            hashlib.sha256(body.encode()).hexdigest(),
+        )
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        method = method.upper()
+        if self.cache_idempotent_only and method not in self.CACHEABLE_METHODS:
+            return self.uncached.request(method, url, **kwargs)
+
+        key = self._key(method, url, kwargs)
+        with self._lock:
+            response = self._cache.get(key)
+            if response is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return response
+
+        response = self.uncached.request(method, url, **kwargs)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = response
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def clear(self):
+        """Drop all cached responses, e.g. between scans"""
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        self.clear()
+        self.uncached.close()
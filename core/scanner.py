@@ -4,64 +4,124 @@ Orchestrates security tests and manages scan sessions
 """
 
 import sys
+import asyncio
+import threading
+import http.cookiejar
+from dataclasses import dataclass, asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import json
-from rich.console import Console
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from rich.console import Console, Group
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
 
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON export, stdlib json is used otherwise
+    orjson = None
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from tests.vulnerability_tests import ALL_TESTS
+from tests.vulnerability_tests import (
+    ALL_TESTS, STATUS_VULNERABLE, STATUS_PASSED, STATUS_INFO,
+    SEV_CRITICAL, SEV_HIGH, SEV_MEDIUM, SEV_LOW
+)
+from helpers import SEVERITY_WEIGHTS, parse_header_line
+from core.http_cache import CachedSession
+
+# Upper bound on tests executed concurrently during a scan
+MAX_WORKERS = 32
+
+# Shared connection pool limits for the async scan path
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 20
+
+# Connection pool sizing for the shared requests.Session
+HTTP_POOL_CONNECTIONS = 20
+HTTP_POOL_MAXSIZE = 100
+
+
+@dataclass(slots=True)
+class Summary:
+    """Aggregated result counters for a scan session"""
+    
+    total_tests: int = 0
+    vulnerabilities_found: int = 0
+    critical: int = 0
+    high: int = 0
+    medium: int = 0
+    low: int = 0
+    info: int = 0
+    passed: int = 0
+    
+    def __getitem__(self, key: str) -> int:
+        # Read-only mapping access for callers written against the old summary dict
+        return getattr(self, key)
+    
+    def get(self, key: str, default: int = 0) -> int:
+        return getattr(self, key, default)
 
 
 class ScanSession:
     """Represents a single security scan session"""
     
+    # Summary counter for each severity of a VULNERABLE result
+    _SEVERITY_KEYS = {
+        SEV_CRITICAL: "critical",
+        SEV_HIGH: "high",
+        SEV_MEDIUM: "medium",
+        SEV_LOW: "low"
+    }
+    
+    # Maps known status strings to the interned constants the tests emit
+    _STATUSES = {s: s for s in (STATUS_VULNERABLE, STATUS_PASSED, STATUS_INFO)}
+    
     def __init__(self, target_url: str, scan_id: str = None):
         self.target_url = target_url
         self.scan_id = scan_id or datetime.now().strftime("%Y%m%d_%H%M%S")
         self.start_time = datetime.now()
         self.end_time = None
         self.results = []
-        self.summary = {
-            "total_tests": 0,
-            "vulnerabilities_found": 0,
-            "critical": 0,
-            "high": 0,
-            "medium": 0,
-            "low": 0,
-            "info": 0,
-            "passed": 0
-        }
+        # Results bucketed by status as they arrive, for display without re-scanning
+        self.vulnerabilities = []
+        self.info_items = []
+        self.summary = Summary()
+        # Kept equal to helpers.calculate_risk_score(self.summary) as results arrive
+        self.risk_score = 0
+        self._lock = threading.Lock()
     
     def add_results(self, test_results: List[Dict]):
-        """Add test results to the session"""
-        self.results.extend(test_results)
-        self.summary["total_tests"] += len(test_results)
-        
-        for result in test_results:
-            status = result.get("status", "").upper()
-            severity = result.get("severity", "").upper()
+        """Add test results to the session (thread-safe)"""
+        with self._lock:
+            self.results.extend(test_results)
+            summary = self.summary
+            summary.total_tests += len(test_results)
             
-            if status == "VULNERABLE":
-                self.summary["vulnerabilities_found"] += 1
+            for result in test_results:
+                # Results from the tests already carry the canonical strings, so
+                # .upper() only runs for results from elsewhere (e.g. loaded JSON)
+                status = result.get("status", "")
+                status = self._STATUSES.get(status) or sys.intern(status.upper())
                 
-                if severity == "CRITICAL":
-                    self.summary["critical"] += 1
-                elif severity == "HIGH":
-                    self.summary["high"] += 1
-                elif severity == "MEDIUM":
-                    self.summary["medium"] += 1
-                elif severity == "LOW":
-                    self.summary["low"] += 1
-            elif status == "INFO":
-                self.summary["info"] += 1
-            elif status == "PASSED":
-                self.summary["passed"] += 1
+                if status is STATUS_VULNERABLE:
+                    summary.vulnerabilities_found += 1
+                    self.vulnerabilities.append(result)
+                    severity = result.get("severity", "")
+                    key = self._SEVERITY_KEYS.get(severity) or self._SEVERITY_KEYS.get(severity.upper())
+                    if key:
+                        setattr(summary, key, getattr(summary, key) + 1)
+                        self.risk_score = min(100, self.risk_score + SEVERITY_WEIGHTS[key])
+                elif status is STATUS_INFO:
+                    summary.info += 1
+                    self.info_items.append(result)
+                elif status is STATUS_PASSED:
+                    summary.passed += 1
     
     def finalize(self):
         """Mark scan as complete"""
@@ -82,7 +142,8 @@ class ScanSession:
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None,
             "duration": self.get_duration(),
-            "summary": self.summary,
+            "summary": asdict(self.summary),
+            "risk_score": self.risk_score,
             "results": self.results
         }
 
@@ -90,10 +151,58 @@ class ScanSession:
 class SecurityScanner:
     """Main security scanner engine"""
     
+    # Rich colour for each finding severity
+    _SEV_COLORS = {
+        "CRITICAL": "red",
+        "HIGH": "orange1",
+        "MEDIUM": "yellow",
+        "LOW": "blue"
+    }
+    
+    _FINDING_TEMPLATE = """[bold]Test:[/bold] {test}
+[bold]URL:[/bold] {url}
+[bold]Method:[/bold] {method}
+[bold]Description:[/bold] {description}
+[bold]Evidence:[/bold] {evidence}
+[bold]Recommendation:[/bold] {recommendation}"""
+    
     def __init__(self):
         self.console = Console()
         self.test_classes = ALL_TESTS
         self.session: Optional[ScanSession] = None
+        
+        # One pooled HTTP session shared by every test so connections and TLS are reused
+        self.http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        # Concurrent tests must not leak login cookies into each other's
+        # deliberately unauthenticated probes, so the shared jar stores nothing
+        self.http.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+        # Identical idempotent probes from different tests are answered from this cache
+        self.http_cache = CachedSession(self.http)
+        
+        # Tests are stateless, so one instance per class is shared across menus and scans
+        self._test_instances = {
+            test_class: test_class(session=self.http_cache) for test_class in self.test_classes
+        }
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Release pooled HTTP connections"""
+        self.http_cache.close()
+    
+    def _get_test(self, test_class):
+        """Return the cached instance of a test class, creating it on first use"""
+        test = self._test_instances.get(test_class)
+        if test is None:
+            test = self._test_instances[test_class] = test_class(session=self.http_cache)
+        return test
     
     def print_banner(self):
         """Print scanner banner"""
@@ -129,9 +238,10 @@ class SecurityScanner:
             if not header:
                 break
             
-            if ':' in header:
-                key, value = header.split(':', 1)
-                headers[key.strip()] = value.strip()
+            parsed = parse_header_line(header)
+            if parsed:
+                key, value = parsed
+                headers[key] = value
             else:
                 self.console.print("[yellow]Invalid format. Use 'Key: Value'[/yellow]")
         
@@ -140,7 +250,7 @@ class SecurityScanner:
         self.console.print("[dim]Available test categories:[/dim]\n")
         
         for idx, test_class in enumerate(self.test_classes, 1):
-            test = test_class()
+            test = self._get_test(test_class)
             self.console.print(f"  {idx}. [{test.severity}] {test.category} - {test.name}")
         
         self.console.print(f"  {len(self.test_classes) + 1}. Run ALL tests (recommended)")
@@ -174,51 +284,104 @@ class SecurityScanner:
         headers = config.get("headers", {})
         selected_tests = config.get("selected_tests", self.test_classes)
         
-        # Create scan session
+        # Create scan session; cached responses never outlive a scan
         self.session = ScanSession(target_url)
+        self.http_cache.clear()
         
         self.console.print(f"\n[bold green]Starting Security Scan[/bold green]")
         self.console.print(f"Target: {target_url}")
         self.console.print(f"Scan ID: {self.session.scan_id}")
         self.console.print(f"Tests: {len(selected_tests)}\n")
         
-        # Run tests with progress indicator
+        # Run tests concurrently with progress indicator
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console
-        ) as progress:
+        ) as progress, ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_WORKERS, len(selected_tests)))
+        ) as executor:
             
+            futures = {}
             for test_class in selected_tests:
-                test = test_class()
+                test = self._get_test(test_class)
                 task = progress.add_task(f"Running: {test.name}", total=None)
+                future = executor.submit(test.run, target_url, headers=headers)
+                futures[future] = (test, task)
+            
+            for future in as_completed(futures):
+                test, task = futures[future]
                 
                 try:
-                    results = test.run(target_url, headers=headers)
+                    results = future.result()
                     self.session.add_results(results)
                     
                     # Show immediate feedback for vulnerabilities
                     vulnerable_count = sum(1 for r in results if r.get("status") == "VULNERABLE")
                     if vulnerable_count > 0:
                         progress.console.print(
-                            f"  [red]⚠ Found {vulnerable_count} potential issue(s)[/red]"
+                            f"  [red]⚠ {test.name}: Found {vulnerable_count} potential issue(s)[/red]"
                         )
                     else:
-                        progress.console.print(f"  [green]✓ Passed[/green]")
+                        progress.console.print(f"  [green]✓ {test.name}: Passed[/green]")
                     
                 except Exception as e:
-                    self.console.print(f"  [red]✗ Error: {str(e)}[/red]")
+                    self.console.print(f"  [red]✗ {test.name}: Error: {str(e)}[/red]")
                 
                 progress.remove_task(task)
         
         self.session.finalize()
         return self.session
     
+    async def run_scan_async(self, config: Dict[str, Any]) -> ScanSession:
+        """Execute the security scan on one event loop with a shared aiohttp connection pool"""
+        target_url = config["target_url"]
+        headers = config.get("headers", {})
+        selected_tests = config.get("selected_tests", self.test_classes)
+        
+        # Create scan session; cached responses never outlive a scan
+        self.session = ScanSession(target_url)
+        self.http_cache.clear()
+        
+        self.console.print(f"\n[bold green]Starting Security Scan (async)[/bold green]")
+        self.console.print(f"Target: {target_url}")
+        self.console.print(f"Scan ID: {self.session.scan_id}")
+        self.console.print(f"Tests: {len(selected_tests)}\n")
+        
+        tests = [self._get_test(test_class) for test_class in selected_tests]
+        connector = aiohttp.TCPConnector(limit=HTTP_POOL_LIMIT, limit_per_host=HTTP_POOL_LIMIT_PER_HOST)
+        
+        # Headers are passed per request so tests can strip auth for unauthenticated probes
+        async with aiohttp.ClientSession(connector=connector) as http:
+            outcomes = await asyncio.gather(
+                *[test.run_async(target_url, http, headers=headers) for test in tests],
+                return_exceptions=True
+            )
+        
+        for test, outcome in zip(tests, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                self.console.print(f"  [red]✗ {test.name}: Error: {str(outcome)}[/red]")
+                continue
+            
+            self.session.add_results(outcome)
+            vulnerable_count = sum(1 for r in outcome if r.get("status") == "VULNERABLE")
+            if vulnerable_count > 0:
+                self.console.print(f"  [red]⚠ {test.name}: Found {vulnerable_count} potential issue(s)[/red]")
+            else:
+                self.console.print(f"  [green]✓ {test.name}: Passed[/green]")
+        
+        self.session.finalize()
+        return self.session
+    
     def display_results(self, session: ScanSession):
         """Display scan results in terminal"""
-        self.console.print("\n" + "="*70)
-        self.console.print("[bold cyan]SCAN RESULTS[/bold cyan]")
-        self.console.print("="*70 + "\n")
+        # Collect everything and print once so Rich renders a single output buffer
+        renderables = []
+        renderables.append("\n" + "="*70)
+        renderables.append("[bold cyan]SCAN RESULTS[/bold cyan]")
+        renderables.append("="*70 + "\n")
         
         # Summary table
         summary_table = Table(title="Scan Summary", box=box.ROUNDED)
@@ -228,84 +391,88 @@ class SecurityScanner:
         summary_table.add_row("Scan ID", session.scan_id)
         summary_table.add_row("Target", session.target_url)
         summary_table.add_row("Duration", session.get_duration())
-        summary_table.add_row("Total Tests", str(session.summary["total_tests"]))
+        summary_table.add_row("Total Tests", str(session.summary.total_tests))
         summary_table.add_row("Vulnerabilities Found", 
-                            f"[red]{session.summary['vulnerabilities_found']}[/red]")
+                            f"[red]{session.summary.vulnerabilities_found}[/red]")
         
-        self.console.print(summary_table)
-        self.console.print()
+        renderables.append(summary_table)
+        renderables.append("")
         
         # Severity breakdown
-        if session.summary["vulnerabilities_found"] > 0:
+        if session.summary.vulnerabilities_found > 0:
             severity_table = Table(title="Vulnerabilities by Severity", box=box.ROUNDED)
             severity_table.add_column("Severity", style="bold")
             severity_table.add_column("Count", justify="right")
             
-            if session.summary["critical"] > 0:
+            if session.summary.critical > 0:
                 severity_table.add_row("[red]CRITICAL[/red]", 
-                                     f"[red]{session.summary['critical']}[/red]")
-            if session.summary["high"] > 0:
+                                     f"[red]{session.summary.critical}[/red]")
+            if session.summary.high > 0:
                 severity_table.add_row("[orange1]HIGH[/orange1]", 
-                                     f"[orange1]{session.summary['high']}[/orange1]")
-            if session.summary["medium"] > 0:
+                                     f"[orange1]{session.summary.high}[/orange1]")
+            if session.summary.medium > 0:
                 severity_table.add_row("[yellow]MEDIUM[/yellow]", 
-                                     f"[yellow]{session.summary['medium']}[/yellow]")
-            if session.summary["low"] > 0:
+                                     f"[yellow]{session.summary.medium}[/yellow]")
+            if session.summary.low > 0:
                 severity_table.add_row("[blue]LOW[/blue]", 
-                                     f"[blue]{session.summary['low']}[/blue]")
+                                     f"[blue]{session.summary.low}[/blue]")
             
-            self.console.print(severity_table)
-            self.console.print()
+            renderables.append(severity_table)
+            renderables.append("")
         
         # Detailed findings
-        vulnerabilities = [r for r in session.results if r.get("status") == "VULNERABLE"]
+        vulnerabilities = session.vulnerabilities
         
         if vulnerabilities:
-            self.console.print("[bold red]DETAILED FINDINGS[/bold red]\n")
+            renderables.append("[bold red]DETAILED FINDINGS[/bold red]\n")
             
             for idx, vuln in enumerate(vulnerabilities, 1):
-                severity_color = {
-                    "CRITICAL": "red",
-                    "HIGH": "orange1",
-                    "MEDIUM": "yellow",
-                    "LOW": "blue"
-                }.get(vuln.get("severity", "MEDIUM"), "yellow")
+                severity_color = self._SEV_COLORS.get(vuln.get("severity", "MEDIUM"), "yellow")
                 
-                panel_content = f"""[bold]Test:[/bold] {vuln.get('test', 'Unknown')}
-[bold]URL:[/bold] {vuln.get('url', 'N/A')}
-[bold]Method:[/bold] {vuln.get('method', 'N/A')}
-[bold]Description:[/bold] {vuln.get('description', 'N/A')}
-[bold]Evidence:[/bold] {vuln.get('evidence', 'N/A')}
-[bold]Recommendation:[/bold] {vuln.get('recommendation', 'N/A')}"""
+                panel_content = self._FINDING_TEMPLATE.format(
+                    test=vuln.get('test', 'Unknown'),
+                    url=vuln.get('url', 'N/A'),
+                    method=vuln.get('method', 'N/A'),
+                    description=vuln.get('description', 'N/A'),
+                    evidence=vuln.get('evidence', 'N/A'),
+                    recommendation=vuln.get('recommendation', 'N/A')
+                )
                 
                 panel = Panel(
                     panel_content,
                     title=f"[{severity_color}]Finding #{idx} - {vuln.get('severity', 'MEDIUM')}[/{severity_color}]",
                     border_style=severity_color
                 )
-                self.console.print(panel)
-                self.console.print()
+                renderables.append(panel)
+                renderables.append("")
         
         # Info findings
-        info_items = [r for r in session.results if r.get("status") == "INFO"]
+        info_items = session.info_items
         if info_items:
-            self.console.print("[bold blue]INFORMATIONAL FINDINGS[/bold blue]\n")
+            renderables.append("[bold blue]INFORMATIONAL FINDINGS[/bold blue]\n")
             for item in info_items:
-                self.console.print(f"  • {item.get('description', 'N/A')}")
-            self.console.print()
+                renderables.append(f"  • {item.get('description', 'N/A')}")
+            renderables.append("")
         
         # Passed tests
-        passed = session.summary["passed"]
+        passed = session.summary.passed
         if passed > 0:
-            self.console.print(f"[green]✓ {passed} test(s) passed with no issues detected[/green]\n")
+            renderables.append(f"[green]✓ {passed} test(s) passed with no issues detected[/green]\n")
+        
+        self.console.print(Group(*renderables))
     
     def save_results(self, session: ScanSession, format: str = "json") -> str:
         """Save results to file"""
         filename = f"scan_{session.scan_id}.{format}"
         
         if format == "json":
-            with open(filename, 'w') as f:
-                json.dump(session.to_dict(), f, indent=2)
+            data = session.to_dict()
+            if orjson is not None:
+                with open(filename, 'wb') as f:
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filename, 'w') as f:
+                    json.dump(data, f, indent=2)
         
         return filename
     
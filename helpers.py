@@ -2,15 +2,33 @@
 Utility functions for API security tester
 """
 
-from typing import Dict, List, Any
-from urllib.parse import urlparse
+from bisect import bisect_right
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Tuple
+from urllib.parse import urlparse, ParseResult
 import re
 
 
+# "Key: Value" header line with surrounding whitespace trimmed
+_HEADER_RE = re.compile(r'^\s*([^:\s]+)\s*:\s*(\S.*?)\s*$')
+
+# Loopback, RFC 1918 private ranges and local hostnames in a single pass
+_INTERNAL_RE = re.compile(
+    r'^(?:127\.|10\.|172\.(?:1[6-9]|2[0-9]|3[01])\.|192\.168\.|localhost$|::1$)'
+)
+
+
+@lru_cache(maxsize=1024)
+def parse_url(url: str) -> ParseResult:
+    """Parse a URL, reusing the result for URLs seen before"""
+    return urlparse(url)
+
+
 def validate_url(url: str) -> bool:
     """Validate if a string is a valid URL"""
     try:
-        result = urlparse(url)
+        result = parse_url(url)
         return all([result.scheme, result.netloc])
     except:
         return False
@@ -18,29 +36,31 @@ def validate_url(url: str) -> bool:
 
 def sanitize_url(url: str) -> str:
     """Sanitize URL for safe display"""
-    parsed = urlparse(url)
+    parsed = parse_url(url)
     # Remove query parameters that might contain sensitive data
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
 
 def extract_base_url(url: str) -> str:
     """Extract base URL from full URL"""
-    parsed = urlparse(url)
+    parsed = parse_url(url)
     return f"{parsed.scheme}://{parsed.netloc}"
 
 
+def parse_header_line(line: str) -> Optional[Tuple[str, str]]:
+    """Split a 'Key: Value' header line, or return None if it is malformed"""
+    match = _HEADER_RE.match(line)
+    return match.groups() if match else None
+
+
 def is_internal_ip(ip: str) -> bool:
     """Check if IP is internal/private"""
-    internal_patterns = [
-        r'^127\.',
-        r'^10\.',
-        r'^172\.(1[6-9]|2[0-9]|3[01])\.',
-        r'^192\.168\.',
-        r'^localhost$',
-        r'^::1$'
-    ]
-    
-    return any(re.match(pattern, ip) for pattern in internal_patterns)
+    return _INTERNAL_RE.match(ip) is not None
+
+
+def is_internal_ip_batch(ips: List[str]) -> List[str]:
+    """Return the internal/private entries from a list of IPs"""
+    return list(filter(_INTERNAL_RE.match, ips))
 
 
 def format_severity(severity: str) -> str:
@@ -65,49 +85,40 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     return text[:max_length - 3] + "..."
 
 
+_SEVERITY_ORDER = ("CRITICAL", "HIGH", "MEDIUM", "LOW", "INFO")
+
+
 def group_results_by_severity(results: List[Dict]) -> Dict[str, List[Dict]]:
     """Group vulnerability results by severity"""
-    grouped = {
-        "CRITICAL": [],
-        "HIGH": [],
-        "MEDIUM": [],
-        "LOW": [],
-        "INFO": []
-    }
-    
+    buckets = defaultdict(list)
     for result in results:
-        severity = result.get("severity", "INFO")
-        if severity in grouped:
-            grouped[severity].append(result)
+        buckets[result.get("severity", "INFO")].append(result)
     
-    return grouped
+    # Fixed severity order; unknown severities are dropped
+    return {severity: buckets.get(severity, []) for severity in _SEVERITY_ORDER}
+
+
+# Risk points contributed by each vulnerability, keyed by summary counter
+SEVERITY_WEIGHTS = {
+    "critical": 25,
+    "high": 15,
+    "medium": 8,
+    "low": 3
+}
+_WEIGHT_VEC = tuple(SEVERITY_WEIGHTS.items())
 
 
 def calculate_risk_score(summary: Dict) -> int:
     """Calculate overall risk score (0-100)"""
-    weights = {
-        "critical": 25,
-        "high": 15,
-        "medium": 8,
-        "low": 3
-    }
-    
-    score = 0
-    score += summary.get("critical", 0) * weights["critical"]
-    score += summary.get("high", 0) * weights["high"]
-    score += summary.get("medium", 0) * weights["medium"]
-    score += summary.get("low", 0) * weights["low"]
-    
+    score = sum(summary.get(key, 0) * weight for key, weight in _WEIGHT_VEC)
     return min(score, 100)  # Cap at 100
 
 
+# Lower score bound of each risk level above LOW
+_RISK_THRESHOLDS = (25, 50, 75)
+_RISK_LABELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
+
 def get_risk_level(score: int) -> str:
     """Get risk level from score"""
-    if score >= 75:
-        return "CRITICAL"
-    elif score >= 50:
-        return "HIGH"
-    elif score >= 25:
-        return "MEDIUM"
-    else:
-        return "LOW"
\ No newline at end of file
+    return _RISK_LABELS[bisect_right(_RISK_THRESHOLDS, score)]
@@ -3,143 +3,156 @@ HTML Report Generator
 Creates interactive HTML security reports
 """
 
+import sys
 from datetime import datetime
 from typing import Dict
 import json
 
 
-def generate_html_report(session_data: Dict, output_file: str):
-    """Generate an interactive HTML report"""
-    
-    summary = session_data["summary"]
-    results = session_data["results"]
-    
-    vulnerabilities = [r for r in results if r.get("status") == "VULNERABLE"]
-    info_items = [r for r in results if r.get("status") == "INFO"]
-    
-    # Calculate severity color
-    def get_severity_color(severity):
-        colors = {
-            "CRITICAL": "#dc3545",
-            "HIGH": "#fd7e14",
-            "MEDIUM": "#ffc107",
-            "LOW": "#0dcaf0",
-            "INFO": "#0d6efd"
-        }
-        return colors.get(severity, "#6c757d")
-    
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>API Security Test Report - {session_data['scan_id']}</title>
-    <style>
-        * {{
+# Result statuses, interned so the categorisation pass compares by identity
+_VULNERABLE = sys.intern("VULNERABLE")
+_INFO = sys.intern("INFO")
+
+
+# Single-pass escape table for user-supplied fields
+_ESCAPE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#39;',
+})
+
+
+def _e(value, default: str = 'N/A') -> str:
+    """Escape a value for HTML, substituting default for None"""
+    if value is None:
+        return default
+    return str(value).translate(_ESCAPE)
+
+
+# Card accent colour per severity
+_SEV_COLORS = {
+    "CRITICAL": "#dc3545",
+    "HIGH": "#fd7e14",
+    "MEDIUM": "#ffc107",
+    "LOW": "#0dcaf0",
+    "INFO": "#0d6efd"
+}
+_SEV_COLORS_GET = _SEV_COLORS.get
+_DEFAULT_SEV_COLOR = "#6c757d"
+
+# Fragments are streamed straight to the file; a large buffer keeps the
+# number of write syscalls low without holding the whole report in memory
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Static stylesheet: plain text, emitted as-is (no format escaping needed)
+_STATIC_CSS = """
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             padding: 20px;
             min-height: 100vh;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background: white;
             border-radius: 12px;
             box-shadow: 0 20px 60px rgba(0,0,0,0.3);
             overflow: hidden;
-        }}
+        }
         
-        .header {{
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 40px;
             text-align: center;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
-        }}
+        }
         
-        .header p {{
+        .header p {
             opacity: 0.9;
             font-size: 1.1em;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 40px;
-        }}
+        }
         
-        .summary-grid {{
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-bottom: 40px;
-        }}
+        }
         
-        .summary-card {{
+        .summary-card {
             background: #f8f9fa;
             padding: 25px;
             border-radius: 8px;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .summary-card h3 {{
+        .summary-card h3 {
             color: #6c757d;
             font-size: 0.9em;
             font-weight: 600;
             text-transform: uppercase;
             margin-bottom: 10px;
-        }}
+        }
         
-        .summary-card .value {{
+        .summary-card .value {
             font-size: 2em;
             font-weight: bold;
             color: #212529;
-        }}
+        }
         
-        .severity-badges {{
+        .severity-badges {
             display: flex;
             gap: 10px;
             flex-wrap: wrap;
             margin-bottom: 40px;
-        }}
+        }
         
-        .badge {{
+        .badge {
             padding: 8px 16px;
             border-radius: 20px;
             font-weight: 600;
             font-size: 0.9em;
             color: white;
-        }}
+        }
         
-        .badge.critical {{ background: #dc3545; }}
-        .badge.high {{ background: #fd7e14; }}
-        .badge.medium {{ background: #ffc107; color: #000; }}
-        .badge.low {{ background: #0dcaf0; }}
-        .badge.info {{ background: #0d6efd; }}
+        .badge.critical { background: #dc3545; }
+        .badge.high { background: #fd7e14; }
+        .badge.medium { background: #ffc107; color: #000; }
+        .badge.low { background: #0dcaf0; }
+        .badge.info { background: #0d6efd; }
         
-        .section {{
+        .section {
             margin-bottom: 40px;
-        }}
+        }
         
-        .section h2 {{
+        .section h2 {
             font-size: 1.8em;
             margin-bottom: 20px;
             color: #212529;
             border-bottom: 2px solid #667eea;
             padding-bottom: 10px;
-        }}
+        }
         
-        .vulnerability-card {{
+        .vulnerability-card {
             background: white;
             border: 1px solid #dee2e6;
             border-radius: 8px;
@@ -147,37 +160,37 @@ def generate_html_report(session_data: Dict, output_file: str):
             margin-bottom: 20px;
             border-left: 4px solid;
             transition: transform 0.2s, box-shadow 0.2s;
-        }}
+        }
         
-        .vulnerability-card:hover {{
+        .vulnerability-card:hover {
             transform: translateY(-2px);
             box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .vuln-header {{
+        .vuln-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 15px;
-        }}
+        }
         
-        .vuln-title {{
+        .vuln-title {
             font-size: 1.3em;
             font-weight: 600;
             color: #212529;
-        }}
+        }
         
-        .vuln-detail {{
+        .vuln-detail {
             margin: 10px 0;
-        }}
+        }
         
-        .vuln-detail strong {{
+        .vuln-detail strong {
             color: #495057;
             display: inline-block;
             width: 150px;
-        }}
+        }
         
-        .code {{
+        .code {
             background: #f8f9fa;
             padding: 12px;
             border-radius: 4px;
@@ -186,79 +199,91 @@ def generate_html_report(session_data: Dict, output_file: str):
             color: #212529;
             overflow-x: auto;
             margin: 10px 0;
-        }}
+        }
         
-        .recommendation {{
+        .recommendation {
             background: #d1ecf1;
             border-left: 4px solid #0dcaf0;
             padding: 15px;
             border-radius: 4px;
             margin-top: 15px;
-        }}
+        }
         
-        .recommendation strong {{
+        .recommendation strong {
             color: #055160;
-        }}
+        }
         
-        .info-list {{
+        .info-list {
             list-style: none;
-        }}
+        }
         
-        .info-list li {{
+        .info-list li {
             padding: 12px;
             background: #f8f9fa;
             margin-bottom: 10px;
             border-radius: 4px;
             border-left: 3px solid #0d6efd;
-        }}
+        }
         
-        .footer {{
+        .footer {
             background: #f8f9fa;
             padding: 20px 40px;
             text-align: center;
             color: #6c757d;
             font-size: 0.9em;
-        }}
+        }
         
-        .chart-container {{
+        .chart-container {
             margin: 30px 0;
             text-align: center;
-        }}
+        }
         
-        .severity-bar {{
+        .severity-bar {
             display: flex;
             height: 40px;
             border-radius: 8px;
             overflow: hidden;
             margin: 20px 0;
-        }}
+        }
         
-        .severity-segment {{
+        .severity-segment {
             display: flex;
             align-items: center;
             justify-content: center;
             color: white;
             font-weight: 600;
             transition: all 0.3s;
-        }}
+        }
         
-        .severity-segment:hover {{
+        .severity-segment:hover {
             opacity: 0.8;
-        }}
+        }
         
-        @media print {{
-            body {{
+        @media print {
+            body {
                 background: white;
                 padding: 0;
-            }}
-            .container {{
+            }
+            .container {
                 box-shadow: none;
-            }}
-            .vulnerability-card {{
+            }
+            .vulnerability-card {
                 page-break-inside: avoid;
-            }}
-        }}
-    </style>
+            }
+        }
+"""
+
+# Document head up to the stylesheet
+_HTML_HEAD_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>API Security Test Report - {scan_id}</title>
+    <style>"""
+
+# Closes the head and renders the summary cards and severity badges
+_SUMMARY_TEMPLATE = """    </style>
 </head>
 <body>
     <div class="container">
@@ -272,27 +297,27 @@ def generate_html_report(session_data: Dict, output_file: str):
             <div class="summary-grid">
                 <div class="summary-card">
                     <h3>Scan ID</h3>
-                    <div class="value" style="font-size: 1.2em;">{session_data['scan_id']}</div>
+                    <div class="value" style="font-size: 1.2em;">{scan_id}</div>
                 </div>
                 <div class="summary-card">
                     <h3>Target URL</h3>
-                    <div class="value" style="font-size: 1em; word-break: break-all;">{session_data['target_url']}</div>
+                    <div class="value" style="font-size: 1em; word-break: break-all;">{target_url}</div>
                 </div>
                 <div class="summary-card">
                     <h3>Total Tests</h3>
-                    <div class="value">{summary['total_tests']}</div>
+                    <div class="value">{total_tests}</div>
                 </div>
                 <div class="summary-card">
                     <h3>Vulnerabilities</h3>
-                    <div class="value" style="color: #dc3545;">{summary['vulnerabilities_found']}</div>
+                    <div class="value" style="color: #dc3545;">{vulnerabilities_found}</div>
                 </div>
                 <div class="summary-card">
                     <h3>Duration</h3>
-                    <div class="value" style="font-size: 1.5em;">{session_data['duration']}</div>
+                    <div class="value" style="font-size: 1.5em;">{duration}</div>
                 </div>
                 <div class="summary-card">
                     <h3>Tests Passed</h3>
-                    <div class="value" style="color: #198754;">{summary['passed']}</div>
+                    <div class="value" style="color: #198754;">{passed}</div>
                 </div>
             </div>
             
@@ -300,73 +325,19 @@ def generate_html_report(session_data: Dict, output_file: str):
             <div class="section">
                 <h2>Severity Distribution</h2>
                 <div class="severity-badges">
-                    <div class="badge critical">CRITICAL: {summary['critical']}</div>
-                    <div class="badge high">HIGH: {summary['high']}</div>
-                    <div class="badge medium">MEDIUM: {summary['medium']}</div>
-                    <div class="badge low">LOW: {summary['low']}</div>
-                    <div class="badge info">INFO: {summary['info']}</div>
-                </div>
-"""
-    
-    # Add severity bar if there are vulnerabilities
-    if summary['vulnerabilities_found'] > 0:
-        total = summary['vulnerabilities_found']
-        critical_pct = (summary['critical'] / total) * 100
-        high_pct = (summary['high'] / total) * 100
-        medium_pct = (summary['medium'] / total) * 100
-        low_pct = (summary['low'] / total) * 100
-        
-        html_content += f"""
-                <div class="severity-bar">
-"""
-        if summary['critical'] > 0:
-            html_content += f"""
-                    <div class="severity-segment" style="width: {critical_pct}%; background: #dc3545;">
-                        {summary['critical']}
-                    </div>
-"""
-        if summary['high'] > 0:
-            html_content += f"""
-                    <div class="severity-segment" style="width: {high_pct}%; background: #fd7e14;">
-                        {summary['high']}
-                    </div>
-"""
-        if summary['medium'] > 0:
-            html_content += f"""
-                    <div class="severity-segment" style="width: {medium_pct}%; background: #ffc107; color: #000;">
-                        {summary['medium']}
-                    </div>
-"""
-        if summary['low'] > 0:
-            html_content += f"""
-                    <div class="severity-segment" style="width: {low_pct}%; background: #0dcaf0;">
-                        {summary['low']}
-                    </div>
-"""
-        html_content += """
+                    <div class="badge critical">CRITICAL: {critical}</div>
+                    <div class="badge high">HIGH: {high}</div>
+                    <div class="badge medium">MEDIUM: {medium}</div>
+                    <div class="badge low">LOW: {low}</div>
+                    <div class="badge info">INFO: {info}</div>
                 </div>
 """
-    
-    html_content += """
-            </div>
-"""
-    
-    # Vulnerabilities section
-    if vulnerabilities:
-        html_content += """
-            <div class="section">
-                <h2>🚨 Vulnerabilities Detected</h2>
-"""
-        
-        for idx, vuln in enumerate(vulnerabilities, 1):
-            severity = vuln.get('severity', 'MEDIUM')
-            color = get_severity_color(severity)
-            
-            html_content += f"""
+
+_VULN_CARD_TEMPLATE = """
                 <div class="vulnerability-card" style="border-left-color: {color};">
                     <div class="vuln-header">
-                        <div class="vuln-title">Finding #{idx}: {vuln.get('test', 'Unknown Test')}</div>
-                        <div class="badge {severity.lower()}">{severity}</div>
+                        <div class="vuln-title">Finding #{idx}: {test}</div>
+                        <div class="badge {severity_lower}">{severity}</div>
                     </div>
                     
                     <div class="vuln-detail">
@@ -374,75 +345,174 @@ def generate_html_report(session_data: Dict, output_file: str):
                     </div>
                     
                     <div class="vuln-detail">
-                        <strong>Description:</strong> {vuln.get('description', 'N/A')}
+                        <strong>Description:</strong> {description}
                     </div>
                     
                     <div class="vuln-detail">
                         <strong>URL:</strong>
-                        <div class="code">{vuln.get('url', 'N/A')}</div>
+                        <div class="code">{url}</div>
                     </div>
                     
                     <div class="vuln-detail">
-                        <strong>Method:</strong> {vuln.get('method', 'N/A')}
+                        <strong>Method:</strong> {method}
                     </div>
                     
                     <div class="vuln-detail">
                         <strong>Evidence:</strong>
-                        <div class="code">{vuln.get('evidence', 'N/A')}</div>
+                        <div class="code">{evidence}</div>
                     </div>
                     
                     <div class="recommendation">
                         <strong>💡 Recommendation:</strong><br>
-                        {vuln.get('recommendation', 'No recommendation provided')}
+                        {recommendation}
                     </div>
                 </div>
 """
+
+
+# Severity bar: (summary key, background, extra inline style) in display order
+_SEVERITY_SEGMENTS = (
+    ('critical', '#dc3545', ''),
+    ('high', '#fd7e14', ''),
+    ('medium', '#ffc107', ' color: #000;'),
+    ('low', '#0dcaf0', ''),
+)
+
+_SEVERITY_SEGMENT_TEMPLATE = """
+                    <div class="severity-segment" style="width: {pct:.2f}%; background: {color};{extra}">
+                        {count}
+                    </div>
+"""
+
+_INFO_ITEM_TEMPLATE = """
+                    <li>{description}</li>
+"""
+
+_FOOTER_TEMPLATE = """
+        </div>
         
-        html_content += """
-            </div>
+        <div class="footer">
+            <p>Report generated on {now}</p>
+            <p>API Security Tester - OWASP API Security Top 10 Scanner</p>
+        </div>
+    </div>
+</body>
+</html>
 """
+
+
+def generate_html_report(session_data: Dict, output_file: str):
+    """Generate an interactive HTML report"""
     
-    # Informational findings
-    if info_items:
-        html_content += """
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    summary = session_data["summary"]
+    results = session_data["results"]
+    total = summary['vulnerabilities_found']
+    crit, high, med, low = summary['critical'], summary['high'], summary['medium'], summary['low']
+    info_ct, passed = summary['info'], summary['passed']
+    
+    vulnerabilities, info_items = [], []
+    add_vuln, add_info = vulnerabilities.append, info_items.append
+    for r in results:
+        status = r.get("status")
+        if status == _VULNERABLE:
+            add_vuln(r)
+        elif status == _INFO:
+            add_info(r)
+    
+    with open(output_file, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        write = f.write
+        write(_HTML_HEAD_TEMPLATE.format(scan_id=_e(session_data['scan_id'])))
+        write(_STATIC_CSS)
+        write(_SUMMARY_TEMPLATE.format(
+            scan_id=_e(session_data['scan_id']),
+            target_url=_e(session_data['target_url']),
+            duration=session_data['duration'],
+            total_tests=summary['total_tests'],
+            vulnerabilities_found=total,
+            passed=passed,
+            critical=crit,
+            high=high,
+            medium=med,
+            low=low,
+            info=info_ct
+        ))
+        
+        # Add severity bar if there are vulnerabilities
+        if total > 0:
+            inv = 100.0 / total
+            
+            write("""
+                <div class="severity-bar">
+""")
+            for key, color, extra in _SEVERITY_SEGMENTS:
+                count = summary[key]
+                if count > 0:
+                    write(_SEVERITY_SEGMENT_TEMPLATE.format(
+                        pct=count * inv, color=color, extra=extra, count=count
+                    ))
+            write("""
+                </div>
+""")
+        
+        write("""
+            </div>
+""")
+        
+        # Vulnerabilities section
+        if vulnerabilities:
+            write("""
+            <div class="section">
+                <h2>🚨 Vulnerabilities Detected</h2>
+""")
+            
+            for idx, vuln in enumerate(vulnerabilities, 1):
+                severity = vuln.get('severity', 'MEDIUM')
+                color = _SEV_COLORS_GET(severity, _DEFAULT_SEV_COLOR)
+                
+                write(_VULN_CARD_TEMPLATE.format(
+                    idx=idx,
+                    color=color,
+                    test=_e(vuln.get('test'), 'Unknown Test'),
+                    severity=_e(severity),
+                    severity_lower=_e(severity.lower()),
+                    description=_e(vuln.get('description')),
+                    url=_e(vuln.get('url')),
+                    method=_e(vuln.get('method')),
+                    evidence=_e(vuln.get('evidence')),
+                    recommendation=_e(vuln.get('recommendation'), 'No recommendation provided')
+                ))
+            
+            write("""
+            </div>
+""")
+        
+        # Informational findings
+        if info_items:
+            write("""
             <div class="section">
                 <h2>ℹ️ Informational Findings</h2>
                 <ul class="info-list">
-"""
-        for item in info_items:
-            html_content += f"""
-                    <li>{item.get('description', 'N/A')}</li>
-"""
-        
-        html_content += """
+""")
+            for item in info_items:
+                write(_INFO_ITEM_TEMPLATE.format(description=_e(item.get('description'))))
+            
+            write("""
                 </ul>
             </div>
-"""
-    
-    # No vulnerabilities message
-    if not vulnerabilities:
-        html_content += """
+""")
+        
+        # No vulnerabilities message
+        if not vulnerabilities:
+            write("""
             <div class="section">
                 <div style="text-align: center; padding: 40px; background: #d1e7dd; border-radius: 8px;">
                     <h2 style="color: #0f5132; border: none;">✅ No Vulnerabilities Detected</h2>
                     <p style="color: #0f5132; margin-top: 10px;">All security tests passed successfully!</p>
                 </div>
             </div>
-"""
-    
-    html_content += f"""
-        </div>
+""")
         
-        <div class="footer">
-            <p>Report generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            <p>API Security Tester - OWASP API Security Top 10 Scanner</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        write(_FOOTER_TEMPLATE.format(now=now_str))
     
     return output_file
\ No newline at end of file
@@ -5,17 +5,55 @@ Interactive API security scanner with comprehensive reporting
 """
 
 import sys
-import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
+from typing import Dict, List
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from core.scanner import SecurityScanner
-from reports.html_generator import generate_html_report
-from reports.pdf_generator import generate_pdf_report
 from rich.console import Console
-import json
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON export, stdlib json is used otherwise
+    orjson = None
+
+
+def export_json_report(session_data: Dict, output_file: str) -> str:
+    """Write the raw scan session as JSON"""
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(session_data, option=orjson.OPT_INDENT_2))
+    else:
+        import json
+        with open(output_file, 'w') as f:
+            json.dump(session_data, f, indent=2)
+    return output_file
+
+
+def export_reports(session_data: Dict, jobs: List[tuple]) -> List[str]:
+    """
+    Run report exporters for one session.
+    
+    Several formats are rendered side by side: JSON/HTML in threads and the
+    CPU-bound PDF layout (the job labelled "PDF") in a separate process so
+    it doesn't hold the GIL.
+    """
+    if len(jobs) == 1:
+        _, exporter, output_file = jobs[0]
+        return [exporter(session_data, output_file)]
+    
+    with ThreadPoolExecutor(max_workers=len(jobs)) as threads, \
+            ProcessPoolExecutor(max_workers=1) as processes:
+        futures = [
+            (processes if label == "PDF" else threads).submit(
+                exporter, session_data, output_file
+            )
+            for label, exporter, output_file in jobs
+        ]
+        return [future.result() for future in futures]
 
 
 def main():
@@ -43,29 +81,26 @@ def main():
         console.print("\n[bold cyan]Generating reports...[/bold cyan]")
         
         exported_files = []
+        jobs = []
         
         # Export based on choice
         if export_choice in ['1', '4']:
-            # JSON export
-            json_file = output_dir / f"{base_filename}.json"
-            with open(json_file, 'w') as f:
-                json.dump(session.to_dict(), f, indent=2)
-            exported_files.append(str(json_file))
-            console.print(f"[green]✓ JSON report saved: {json_file.name}[/green]")
+            jobs.append(("JSON", export_json_report, str(output_dir / f"{base_filename}.json")))
         
+        # Report generators are imported on demand; reportlab in particular
+        # is slow to load and not needed for JSON-only exports
         if export_choice in ['2', '4']:
-            # HTML export
-            html_file = output_dir / f"{base_filename}.html"
-            generate_html_report(session.to_dict(), str(html_file))
-            exported_files.append(str(html_file))
-            console.print(f"[green]✓ HTML report saved: {html_file.name}[/green]")
+            from reports.html_generator import generate_html_report
+            jobs.append(("HTML", generate_html_report, str(output_dir / f"{base_filename}.html")))
         
         if export_choice in ['3', '4']:
-            # PDF export
-            pdf_file = output_dir / f"{base_filename}.pdf"
-            generate_pdf_report(session.to_dict(), str(pdf_file))
-            exported_files.append(str(pdf_file))
-            console.print(f"[green]✓ PDF report saved: {pdf_file.name}[/green]")
+            from reports.pdf_generator import generate_pdf_report
+            jobs.append(("PDF", generate_pdf_report, str(output_dir / f"{base_filename}.pdf")))
+        
+        if jobs:
+            for (label, _, _), output_file in zip(jobs, export_reports(session.to_dict(), jobs)):
+                exported_files.append(output_file)
+                console.print(f"[green]✓ {label} report saved: {Path(output_file).name}[/green]")
         
         console.print("\n[bold green]✓ Scan completed successfully![/bold green]")
         
@@ -75,8 +110,8 @@ def main():
                 console.print(f"  • {file}")
         
         # Summary
-        if session.summary['vulnerabilities_found'] > 0:
-            console.print(f"\n[bold red]⚠ Action Required: {session.summary['vulnerabilities_found']} vulnerabilities found[/bold red]")
+        if session.summary.vulnerabilities_found > 0:
+            console.print(f"\n[bold red]⚠ Action Required: {session.summary.vulnerabilities_found} vulnerabilities found[/bold red]")
             console.print("[yellow]Review the reports and address critical/high severity issues immediately.[/yellow]")
         else:
             console.print("\n[bold green]✓ No vulnerabilities detected in this scan[/bold green]")
@@ -90,6 +125,8 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        scanner.close()
 
 
 if __name__ == "__main__":
@@ -3,13 +3,246 @@ Coordinator Agent - Plans and orchestrates security scans
 Uses Azure OpenAI to intelligently decide which tests to run
 """
 import os
+import io
+import re
 import json
-from typing import Dict, List, Optional
+import math
+import time
+import asyncio
+import hashlib
+import contextlib
+import weakref
+import importlib
+import importlib.util
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import (
+    DEFAULT_CONNECTION_LIMITS, APIConnectionError, AsyncAzureOpenAI, DefaultAsyncHttpxClient,
+    RateLimitError, Timeout
+)
+from pydantic import BaseModel, field_validator
+
+try:
+    from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+except ImportError:  # Optional: extra 429 backoff; the SDK's own retries still apply
+    retry = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster parsing of completion JSON
+    orjson = None
+
+_loads = orjson.loads if orjson is not None else json.loads
 
 load_dotenv()
 
+# Output caps; both responses are a few hundred tokens of JSON. A reply cut
+# off by its cap is retried once with double the budget, up to MAX_OUTPUT_TOKENS
+ANALYSIS_MAX_TOKENS = 600
+PLAN_MAX_TOKENS = 1200
+MAX_OUTPUT_TOKENS = int(os.getenv("AZURE_OPENAI_MAX_OUTPUT_TOKENS", "16384"))
+
+
+class CompletionTruncatedError(ValueError):
+    """The model hit max_tokens before finishing its JSON reply"""
+
+
+# Endpoints per batched analysis request; larger lists are split and sent
+# concurrently so one reply never needs more than the deployment can output
+ANALYSIS_BATCH_SIZE = 10
+
+# Concurrent LLM requests plan_scans() allows, to stay inside Azure TPM limits
+MAX_PLAN_CONCURRENCY = 8
+
+
+# HTTP/2 needs the optional h2 package; without it the pool stays on HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool sizing and timeouts; Limits comes from the httpx build the SDK uses
+_httpx = importlib.import_module(type(DEFAULT_CONNECTION_LIMITS).__module__)
+HTTP_LIMITS = _httpx.Limits(max_keepalive_connections=20, max_connections=50)
+HTTP_TIMEOUT = Timeout(60, connect=5)
+
+# Clients per event loop, then per configuration. Entries go away with their loop.
+# Connections on a finished loop are unusable and can't be awaited closed from another,
+# so dropping the client lets the garbage collector release its sockets.
+_SHARED_CLIENTS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _azure_client(api_key: Optional[str], api_version: Optional[str],
+                  azure_endpoint: Optional[str]) -> AsyncAzureOpenAI:
+    """
+    Azure OpenAI client shared by agents created on the same event loop, so they
+    reuse one connection pool. A pool can't move between loops, so agents built
+    outside a running loop, or on a new one, get a fresh client.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    config = (api_key, api_version, azure_endpoint)
+    if loop is not None and config in _SHARED_CLIENTS.get(loop, {}):
+        return _SHARED_CLIENTS[loop][config]
+    
+    client = AsyncAzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=azure_endpoint,
+        # Retries are handled by _retry_on_rate_limit; SDK retries would multiply them
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(
+            http2=_HTTP2_AVAILABLE, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT
+        )
+    )
+    if loop is not None:
+        _SHARED_CLIENTS.setdefault(loop, {})[config] = client
+    return client
+
+
+# Longest single backoff between retried completion requests, in seconds
+MAX_RETRY_WAIT = 30.0
+
+
+def _retry_after_seconds(exc: Optional[BaseException]) -> Optional[float]:
+    """Delay requested by the server via retry-after-ms / retry-after, if any"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) * scale)
+        except ValueError:
+            continue  # HTTP-date form; fall back to backoff
+    return None
+
+
+def _retry_on_rate_limit(func):
+    """
+    Retry an async call on HTTP 429 or a dropped connection, if tenacity is installed.
+    Waits as long as the server's Retry-After asks, else jittered exponential backoff.
+    """
+    if retry is None:
+        return func
+    backoff = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)
+
+    def wait(retry_state):
+        delay = _retry_after_seconds(retry_state.outcome.exception())
+        if delay is None:
+            return backoff(retry_state)
+        return min(delay, MAX_RETRY_WAIT)
+
+    return retry(
+        retry=retry_if_exception_type((RateLimitError, APIConnectionError)),
+        wait=wait,
+        stop=stop_after_attempt(5),
+        reraise=True,
+    )(func)
+
+
+# Static instructions come first and per-call data last, so repeated calls
+# share a long identical prefix that Azure OpenAI can serve from its prompt cache
+ANALYSIS_PROMPT_PREFIX = """Analyze an API endpoint and provide security recommendations.
+
+Determine:
+1. API type (REST, GraphQL, etc.)
+2. Authentication method (Bearer, API Key, OAuth, None)
+3. Data sensitivity level (Low, Medium, High, Critical)
+4. Likely purpose/business domain
+5. Key risk areas to focus on
+
+Respond in JSON format:
+{
+    "api_type": "REST",
+    "auth_method": "Bearer Token",
+    "data_sensitivity": "High",
+    "domain": "Financial Services",
+    "risk_areas": ["authentication", "authorization", "data_exposure"],
+    "reasoning": "Brief explanation"
+}
+
+The endpoint to analyze follows."""
+
+STATIC_PROMPT_PREFIX = """Create an optimal security testing plan for the API analysis given at the end.
+
+Available test categories (OWASP API Security Top 10, 2023): API1 BOLA, API2 Broken Authentication, API3 Object Property Authorization, API4 Resource Consumption, API5 Function Level Authorization, API7 SSRF, API8 Security Misconfiguration, API9 Inventory Management, API10 Injection
+
+Respond with a JSON object of this shape:
+{"priority_tests": [{"test_id": "API2", "test_name": "Broken Authentication", "priority": "CRITICAL|HIGH|MEDIUM|LOW", "reason": "...", "parameters": {"focus_areas": ["..."], "intensity": "low|medium|high"}}], "recommended_order": ["API2", "API1"], "estimated_duration_minutes": 15, "special_considerations": ["..."]}
+
+Prioritize based on:
+- Data sensitivity level
+- Authentication complexity
+- Risk areas identified
+- Likely attack vectors for this domain"""
+
+
+# Shape create_scan_plan() validates responses against
+class PlannedTest(BaseModel):
+    test_id: str
+    test_name: str
+    priority: str
+    reason: str = ""
+    parameters: Dict = {}
+
+
+class ScanPlan(BaseModel):
+    priority_tests: List[PlannedTest]
+    recommended_order: List[str] = []
+    estimated_duration_minutes: int = 0
+    special_considerations: List[str] = []
+    
+    @field_validator("estimated_duration_minutes", mode="before")
+    @classmethod
+    def _coerce_minutes(cls, value: Any) -> int:
+        """Models write "15", 15.5 or "10-15"; keep the upper bound, or 0 if there's no number"""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return round(value)
+        numbers = re.findall(r"\d+(?:\.\d+)?", value) if isinstance(value, str) else []
+        return round(float(numbers[-1])) if numbers else 0
+
+
+def _parse_scan_plan(content: str) -> Dict:
+    return ScanPlan.model_validate_json(content).model_dump()
+
+
+# Routes requests sharing a prefix to the same cache shard
+_ANALYSIS_CACHE_KEY = hashlib.sha256(ANALYSIS_PROMPT_PREFIX.encode()).hexdigest()
+_PLAN_CACHE_KEY = hashlib.sha256(STATIC_PROMPT_PREFIX.encode()).hexdigest()
+
+# Shared by every request; the SDK only reads the message dicts
+_ANALYSIS_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a security expert specializing in API security assessment."
+}
+_PLAN_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an expert penetration tester planning API security assessments."
+}
+
+# Coarse buckets used to compare a heuristic analysis with the model's answer
+_AUTH_BUCKETS = (
+    ("api_key", ("api key", "api-key", "apikey", "x-api-key")),
+    ("basic", ("basic",)),
+    ("bearer", ("bearer", "jwt", "oauth", "token")),
+)
+_HIGH_SENSITIVITY_HINTS = (
+    "pay", "bank", "account", "card", "wallet", "billing", "finance",
+    "health", "patient", "medical", "admin", "auth", "login", "token",
+)
+
+
+def _auth_bucket(auth_method: Optional[str]) -> str:
+    """Map a free-form auth description to a coarse bucket"""
+    value = (auth_method or "").lower()
+    for bucket, needles in _AUTH_BUCKETS:
+        if any(needle in value for needle in needles):
+            return bucket
+    return "none"
+
 
 class CoordinatorAgent:
     """
@@ -22,15 +255,143 @@ class CoordinatorAgent:
     4. Create an execution plan for the scanner agent
     """
     
-    def __init__(self):
+    def __init__(self, cache_ttl: float = 3600.0, cache_maxsize: int = 256,
+                 semantic_threshold: float = 0.97):
         # Initialize Azure OpenAI client
-        self.client = AzureOpenAI(
-            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+        self.client = _azure_client(
+            os.getenv("AZURE_OPENAI_API_KEY"),
+            os.getenv("AZURE_OPENAI_API_VERSION"),
+            os.getenv("AZURE_OPENAI_ENDPOINT")
         )
         self.deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+        # Running token totals across all calls made by this agent
+        self.usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
         
+        # Response cache: exact matches on the full request, plus an optional
+        # semantic tier for analyze_api() when an embedding deployment is set
+        self.embedding_deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+        self.cache_ttl = cache_ttl
+        self.cache_maxsize = cache_maxsize
+        self.semantic_threshold = semantic_threshold
+        self._exact_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._semantic_cache: List[Tuple[float, List[float], str]] = []
+        self._cache_counts = {"exact_hits": 0, "semantic_hits": 0, "misses": 0}
+    
+    async def _complete(self, parse: Callable[[str], Any], **kwargs) -> Any:
+        """
+        Stream one chat completion and return parse() applied to its content.
+        
+        Identical requests within cache_ttl are answered from the exact cache.
+        A reply is only cached once parse() accepts it and the model finished
+        on its own, so a malformed or truncated answer is re-requested next time.
+        A reply cut off by max_tokens is retried once with a doubled limit, then
+        raises CompletionTruncatedError.
+        Token usage reported in the final chunk is added to self.usage.
+        Cancelling the awaiting task closes the stream, so a discarded
+        speculative plan stops consuming tokens.
+        """
+        key = hashlib.blake2b(
+            json.dumps({"model": self.deployment, **kwargs}, sort_keys=True).encode()
+        ).hexdigest()
+        cached = self._exact_cache.get(key)
+        if cached is not None:
+            stamp, content = cached
+            if time.monotonic() - stamp < self.cache_ttl:
+                self._exact_cache.move_to_end(key)
+                self._cache_counts["exact_hits"] += 1
+                return parse(content)
+            del self._exact_cache[key]
+        self._cache_counts["misses"] += 1
+        
+        content, finish_reason = await self._stream_content(**kwargs)
+        limit = kwargs.get("max_tokens")
+        if finish_reason == "length" and limit and limit < MAX_OUTPUT_TOKENS:
+            retry_kwargs = {**kwargs, "max_tokens": min(limit * 2, MAX_OUTPUT_TOKENS)}
+            content, finish_reason = await self._stream_content(**retry_kwargs)
+        if finish_reason == "length":
+            raise CompletionTruncatedError(
+                f"Completion still cut off by max_tokens after retrying (initial limit {limit})"
+            )
+        
+        result = parse(content)
+        self._exact_cache[key] = (time.monotonic(), content)
+        if len(self._exact_cache) > self.cache_maxsize:
+            self._exact_cache.popitem(last=False)
+        return result
+    
+    async def _stream_content(self, **kwargs) -> Tuple[str, Optional[str]]:
+        """Assembled content and finish_reason of one streamed completion"""
+        stream = await self._create_stream(**kwargs)
+        buffer = io.StringIO()
+        finish_reason = None
+        async for chunk in stream:
+            # Azure sends content-filter chunks with no choices; usage arrives last
+            if chunk.choices:
+                choice = chunk.choices[0]
+                delta = choice.delta.content
+                if delta:
+                    buffer.write(delta)
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+            if chunk.usage is not None:
+                for field in self.usage:
+                    self.usage[field] += getattr(chunk.usage, field, 0) or 0
+        
+        return buffer.getvalue(), finish_reason
+    
+    @_retry_on_rate_limit
+    async def _create_stream(self, **kwargs):
+        return await self.client.chat.completions.create(
+            model=self.deployment,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs
+        )
+    
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        """Unit-length embedding of text, or None if the semantic tier is unavailable"""
+        if not self.embedding_deployment:
+            return None
+        try:
+            response = await self.client.embeddings.create(
+                model=self.embedding_deployment, input=text
+            )
+        except Exception:
+            # The cache must never fail a call; fall back to exact matching only
+            return None
+        vector = response.data[0].embedding
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+    
+    def _semantic_lookup(self, vector: List[float]) -> Optional[str]:
+        """Content cached for the most similar live entry above semantic_threshold"""
+        now = time.monotonic()
+        self._semantic_cache = [
+            entry for entry in self._semantic_cache if now - entry[0] < self.cache_ttl
+        ]
+        best_score, best_content = 0.0, None
+        for _, cached_vector, content in self._semantic_cache:
+            score = sum(a * b for a, b in zip(vector, cached_vector))
+            if score > best_score:
+                best_score, best_content = score, content
+        if best_score >= self.semantic_threshold:
+            self._cache_counts["semantic_hits"] += 1
+            return best_content
+        return None
+    
+    def _semantic_store(self, vector: List[float], content: str):
+        self._semantic_cache.append((time.monotonic(), vector, content))
+        if len(self._semantic_cache) > self.cache_maxsize:
+            del self._semantic_cache[0]
+    
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters and current size of both cache tiers"""
+        return {
+            **self._cache_counts,
+            "exact_entries": len(self._exact_cache),
+            "semantic_entries": len(self._semantic_cache),
+        }
+    
     async def analyze_api(self, target_url: str, headers: Optional[Dict] = None) -> Dict:
         """
         Analyzes the target API to understand its structure and purpose.
@@ -42,49 +403,109 @@ class CoordinatorAgent:
         Returns:
             Analysis containing API type, authentication method, risk profile
         """
-        prompt = f"""
-        Analyze this API endpoint and provide security recommendations:
-        
-        URL: {target_url}
-        Headers: {json.dumps(headers or {}, indent=2)}
-        
-        Determine:
-        1. API type (REST, GraphQL, etc.)
-        2. Authentication method (Bearer, API Key, OAuth, None)
-        3. Data sensitivity level (Low, Medium, High, Critical)
-        4. Likely purpose/business domain
-        5. Key risk areas to focus on
-        
-        Respond in JSON format:
-        {{
-            "api_type": "REST",
-            "auth_method": "Bearer Token",
-            "data_sensitivity": "High",
-            "domain": "Financial Services",
-            "risk_areas": ["authentication", "authorization", "data_exposure"],
-            "reasoning": "Brief explanation"
-        }}
-        """
+        # Similar endpoints (same URL shape and auth scheme) share an analysis
+        guess = self._heuristic_analysis(target_url, headers)
+        vector = await self._embed(f"{target_url} auth={guess['auth_method']}")
+        if vector is not None:
+            cached = self._semantic_lookup(vector)
+            if cached is not None:
+                return _loads(cached)
         
-        response = self.client.chat.completions.create(
-            model=self.deployment,
+        prompt = (
+            ANALYSIS_PROMPT_PREFIX
+            + f"\n\nURL: {target_url}\nHeaders: {json.dumps(headers or {}, indent=2)}"
+        )
+        
+        analysis = await self._complete(
+            _loads,
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are a security expert specializing in API security assessment."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
+                _ANALYSIS_SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt}
             ],
             temperature=0.3,  # Lower temperature for more consistent analysis
-            response_format={"type": "json_object"}
+            max_tokens=ANALYSIS_MAX_TOKENS,
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": _ANALYSIS_CACHE_KEY}
         )
         
-        analysis = json.loads(response.choices[0].message.content)
+        if vector is not None:
+            self._semantic_store(vector, json.dumps(analysis))
         return analysis
     
+    async def analyze_apis(self, targets: List[Tuple[str, Optional[Dict]]],
+                           max_concurrency: int = MAX_PLAN_CONCURRENCY) -> List[Dict]:
+        """
+        Analyzes several endpoints, batching up to ANALYSIS_BATCH_SIZE per request.
+        
+        Args:
+            targets: (url, headers) pairs to analyze
+            max_concurrency: Upper bound on simultaneous analysis requests
+            
+        Returns:
+            One analysis per target, in the same order
+        """
+        analyses = await self._gather_analyses(targets, asyncio.Semaphore(max_concurrency))
+        for analysis in analyses:
+            if isinstance(analysis, BaseException):
+                raise analysis
+        return analyses
+    
+    async def _gather_analyses(self, targets: List[Tuple[str, Optional[Dict]]],
+                               slots: asyncio.Semaphore) -> List[Any]:
+        """One analysis per target, or the exception that prevented it; requests hold a slot"""
+        batches = await asyncio.gather(*(
+            self._analyze_batch(targets[i:i + ANALYSIS_BATCH_SIZE], slots)
+            for i in range(0, len(targets), ANALYSIS_BATCH_SIZE)
+        ))
+        return [analysis for batch in batches for analysis in batch]
+    
+    async def _analyze_batch(self, targets: List[Tuple[str, Optional[Dict]]],
+                             slots: asyncio.Semaphore) -> List[Any]:
+        """Analyzes up to ANALYSIS_BATCH_SIZE endpoints with a single completion request"""
+        if len(targets) > 1:
+            endpoints = [{"url": url, "headers": headers or {}} for url, headers in targets]
+            prompt = (
+                ANALYSIS_PROMPT_PREFIX
+                + "\n\nAnalyze each endpoint below independently. Respond with "
+                + '{"analyses": [...]} holding one object of the format above per endpoint, '
+                + "in the same order:\n"
+                + json.dumps(endpoints)
+            )
+            
+            def parse(content: str) -> List[Dict]:
+                analyses = _loads(content).get("analyses")
+                if not isinstance(analyses, list) or len(analyses) != len(targets):
+                    raise ValueError("batched analysis does not have one entry per endpoint")
+                return analyses
+            
+            try:
+                async with slots:
+                    return await self._complete(
+                        parse,
+                        messages=[
+                            _ANALYSIS_SYSTEM_MESSAGE,
+                            {"role": "user", "content": prompt}
+                        ],
+                        temperature=0.3,
+                        max_tokens=min(ANALYSIS_MAX_TOKENS * len(targets), MAX_OUTPUT_TOKENS),
+                        response_format={"type": "json_object"},
+                        extra_body={"prompt_cache_key": _ANALYSIS_CACHE_KEY}
+                    )
+            except ValueError:
+                # Model dropped, merged or garbled entries; analyze the endpoints one by one instead
+                pass
+            except Exception as e:
+                return [e] * len(targets)
+        
+        async def _analyze(url: str, headers: Optional[Dict]) -> Dict:
+            async with slots:
+                return await self.analyze_api(url, headers)
+        
+        return list(await asyncio.gather(
+            *(_analyze(url, headers) for url, headers in targets),
+            return_exceptions=True
+        ))
+    
     async def create_scan_plan(self, api_analysis: Dict) -> Dict:
         """
         Creates an intelligent scan plan based on API analysis.
@@ -95,71 +516,83 @@ class CoordinatorAgent:
         Returns:
             Prioritized test plan with specific parameters
         """
-        prompt = f"""
-        Based on this API analysis, create an optimal security testing plan:
-        
-        {json.dumps(api_analysis, indent=2)}
-        
-        Available test categories (OWASP API Security Top 10):
-        1. API1:2023 - Broken Object Level Authorization (BOLA)
-        2. API2:2023 - Broken Authentication
-        3. API3:2023 - Broken Object Property Level Authorization
-        4. API4:2023 - Unrestricted Resource Consumption
-        5. API5:2023 - Broken Function Level Authorization
-        6. API7:2023 - Server Side Request Forgery (SSRF)
-        7. API8:2023 - Security Misconfiguration
-        8. API9:2023 - Improper Inventory Management
-        9. API10:2023 - Injection Vulnerabilities
-        
-        Create a prioritized test plan in JSON format:
-        {{
-            "priority_tests": [
-                {{
-                    "test_id": "API2",
-                    "test_name": "Broken Authentication",
-                    "priority": "CRITICAL",
-                    "reason": "API uses Bearer tokens, high value target",
-                    "parameters": {{
-                        "focus_areas": ["token_validation", "session_management"],
-                        "intensity": "high"
-                    }}
-                }}
-            ],
-            "recommended_order": ["API2", "API5", "API1", "API10", "API8"],
-            "estimated_duration_minutes": 15,
-            "special_considerations": ["Rate limiting may trigger after 10 requests"]
-        }}
-        
-        Prioritize based on:
-        - Data sensitivity level
-        - Authentication complexity
-        - Risk areas identified
-        - Likely attack vectors for this domain
-        """
+        prompt = STATIC_PROMPT_PREFIX + "\n\nAPI Analysis:\n" + json.dumps(api_analysis)
         
-        response = self.client.chat.completions.create(
-            model=self.deployment,
+        # Rejects malformed plans here rather than deep inside plan_scan()
+        return await self._complete(
+            _parse_scan_plan,
             messages=[
-                {
-                    "role": "system",
-                    "content": "You are an expert penetration tester planning API security assessments."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
+                _PLAN_SYSTEM_MESSAGE,
+                {"role": "user", "content": prompt}
             ],
             temperature=0.4,
-            response_format={"type": "json_object"}
+            max_tokens=PLAN_MAX_TOKENS,
+            response_format={"type": "json_object"},
+            extra_body={"prompt_cache_key": _PLAN_CACHE_KEY}
         )
+    
+    @staticmethod
+    def _heuristic_analysis(target_url: str, headers: Optional[Dict] = None) -> Dict:
+        """
+        Cheap local guess at analyze_api()'s answer, used to start planning early.
         
-        scan_plan = json.loads(response.choices[0].message.content)
-        return scan_plan
+        Args:
+            target_url: The API endpoint to analyze
+            headers: Optional authentication headers
+            
+        Returns:
+            Analysis dict with the same keys analyze_api() produces
+        """
+        lowered = {k.lower(): str(v) for k, v in (headers or {}).items()}
+        authorization = lowered.get("authorization", "")
+        scheme = authorization.split(" ", 1)[0].lower()
+        
+        if "x-api-key" in lowered or "api-key" in lowered:
+            auth_method = "API Key"
+        elif scheme == "basic":
+            auth_method = "Basic"
+        elif authorization:
+            auth_method = "Bearer Token"
+        else:
+            auth_method = "None"
+        
+        url = target_url.lower()
+        sensitive = any(hint in url for hint in _HIGH_SENSITIVITY_HINTS)
+        
+        return {
+            "api_type": "GraphQL" if "graphql" in url else "REST",
+            "auth_method": auth_method,
+            "data_sensitivity": "High" if sensitive else "Medium",
+            "domain": "Unknown",
+            "risk_areas": ["authentication", "authorization", "data_exposure"],
+            "reasoning": "Heuristic pre-analysis from URL and headers"
+        }
+    
+    @staticmethod
+    def _analysis_matches(guess: Dict, analysis: Dict) -> bool:
+        """True if a speculative plan built from guess is still valid for analysis"""
+        return (
+            _auth_bucket(guess.get("auth_method")) == _auth_bucket(analysis.get("auth_method"))
+            and str(guess.get("data_sensitivity", "")).lower()
+            == str(analysis.get("data_sensitivity", "")).lower()
+        )
+    
+    @staticmethod
+    async def _discard(task: asyncio.Task):
+        """Cancel a speculative task and reap it, so its failure is never logged"""
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await task
     
     async def plan_scan(self, target_url: str, headers: Optional[Dict] = None) -> Dict:
         """
         Main entry point: Analyzes API and creates complete scan plan.
         
+        Planning starts speculatively from a heuristic analysis while the real
+        analysis is in flight; the speculative plan is kept if the model agrees
+        on auth method and data sensitivity, otherwise it is discarded and the
+        plan is rebuilt from the real analysis.
+        
         Args:
             target_url: API endpoint to scan
             headers: Optional authentication headers
@@ -169,15 +602,30 @@ class CoordinatorAgent:
         """
         print("🤖 Coordinator Agent: Analyzing target API...")
         
-        # Step 1: Analyze the API
-        api_analysis = await self.analyze_api(target_url, headers)
+        # Step 1: Analyze the API, planning speculatively in parallel
+        guess = self._heuristic_analysis(target_url, headers)
+        spec_plan_task = asyncio.create_task(self.create_scan_plan(guess))
+        try:
+            api_analysis = await self.analyze_api(target_url, headers)
+        except BaseException:
+            await self._discard(spec_plan_task)
+            raise
         print(f"✓ Analysis complete: {api_analysis['domain']} API")
         print(f"  Data Sensitivity: {api_analysis['data_sensitivity']}")
         print(f"  Auth Method: {api_analysis['auth_method']}")
         
         # Step 2: Create scan plan
         print("\n🤖 Coordinator Agent: Creating scan plan...")
-        scan_plan = await self.create_scan_plan(api_analysis)
+        scan_plan = None
+        if self._analysis_matches(guess, api_analysis):
+            try:
+                scan_plan = await spec_plan_task
+            except Exception:
+                pass  # A failed guess only costs the wasted request
+        else:
+            await self._discard(spec_plan_task)
+        if scan_plan is None:
+            scan_plan = await self.create_scan_plan(api_analysis)
         print(f"✓ Plan created: {len(scan_plan['priority_tests'])} tests prioritized")
         print(f"  Estimated duration: {scan_plan['estimated_duration_minutes']} minutes")
         
@@ -188,6 +636,54 @@ class CoordinatorAgent:
             "target_url": target_url,
             "headers": headers or {}
         }
+    
+    async def plan_scans(self, targets: List[Tuple[str, Optional[Dict]]],
+                         max_concurrency: int = MAX_PLAN_CONCURRENCY) -> List[Dict]:
+        """
+        Plans scans for several endpoints concurrently.
+        
+        Endpoints are analyzed in batched requests, then their plans are
+        created in parallel; at most max_concurrency requests of either kind
+        are in flight. A target whose analysis or planning fails gets an
+        "error" entry instead of a plan.
+        
+        Args:
+            targets: (url, headers) pairs to scan
+            max_concurrency: Upper bound on simultaneous LLM requests
+            
+        Returns:
+            One plan_scan()-style result per target, in the same order
+        """
+        print(f"🤖 Coordinator Agent: Analyzing {len(targets)} target APIs...")
+        slots = asyncio.Semaphore(max_concurrency)
+        analyses = await self._gather_analyses(targets, slots)
+        
+        async def _plan(api_analysis: Any) -> Dict:
+            if isinstance(api_analysis, BaseException):
+                raise api_analysis
+            async with slots:
+                return await self.create_scan_plan(api_analysis)
+        
+        plans = await asyncio.gather(
+            *(_plan(api_analysis) for api_analysis in analyses),
+            return_exceptions=True
+        )
+        
+        results = []
+        for (target_url, headers), api_analysis, scan_plan in zip(targets, analyses, plans):
+            result = {
+                "api_analysis": None if isinstance(api_analysis, BaseException) else api_analysis,
+                "target_url": target_url,
+                "headers": headers or {}
+            }
+            if isinstance(scan_plan, BaseException):
+                print(f"✗ {target_url}: planning failed ({scan_plan})")
+                result["error"] = str(scan_plan)
+            else:
+                print(f"✓ {target_url}: {len(scan_plan['priority_tests'])} tests prioritized")
+                result["scan_plan"] = scan_plan
+            results.append(result)
+        return results
 
 
 # Test the agent (when run directly)
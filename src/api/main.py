@@ -5,9 +5,9 @@ Provides REST endpoints for triggering and retrieving security scans.
 
 import sys
 import uuid
-import asyncio
 from pathlib import Path
 from typing import Dict, List, Optional
+from dataclasses import asdict
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks
@@ -57,6 +57,7 @@ class ScanResult(BaseModel):
     started_at: str
     completed_at: Optional[str] = None
     summary: Optional[dict] = None
+    risk_score: Optional[int] = None
     results: Optional[List[dict]] = None
     ai_plan: Optional[dict] = None
 
@@ -79,21 +80,21 @@ async def run_scan_background(scan_id: str, target_url: str, headers: Dict, use_
             except Exception as e:
                 scan_store[scan_id]["ai_plan_error"] = str(e)
 
-        # Step 2: Execute security tests
-        scanner = SecurityScanner()
-        config = {
-            "target_url": target_url,
-            "headers": headers,
-            "selected_tests": scanner.test_classes,
-        }
-
-        loop = asyncio.get_event_loop()
-        session: ScanSession = await loop.run_in_executor(None, scanner.run_scan, config)
+        # Step 2: Execute security tests on this event loop; high-volume tests
+        # use native aiohttp I/O, the rest run in worker threads
+        with SecurityScanner() as scanner:
+            config = {
+                "target_url": target_url,
+                "headers": headers,
+                "selected_tests": scanner.test_classes,
+            }
+            session: ScanSession = await scanner.run_scan_async(config)
 
         scan_store[scan_id].update({
             "status": "completed",
             "completed_at": datetime.now().isoformat(),
-            "summary": session.summary,
+            "summary": asdict(session.summary),
+            "risk_score": session.risk_score,
             "results": session.results,
             "ai_plan": ai_plan,
         })
@@ -131,6 +132,7 @@ async def create_scan(request: ScanRequest, background_tasks: BackgroundTasks):
         "started_at": started_at,
         "completed_at": None,
         "summary": None,
+        "risk_score": None,
         "results": None,
         "ai_plan": None,
     }
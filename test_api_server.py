@@ -4,10 +4,50 @@ A simple Flask API with intentional vulnerabilities for testing purposes
 DO NOT USE IN PRODUCTION - FOR TESTING ONLY
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import JSONProvider
+import json
+import re
 import secrets
+from itertools import count
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding, Flask's default provider is used otherwise
+    orjson = None
+
+try:
+    from waitress import serve
+except ImportError:  # Optional: multi-threaded WSGI server, Flask's dev server is used otherwise
+    serve = None
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson; keys stay sorted like the default provider"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+
+def _dumps(obj) -> bytes:
+    """Compact, key-sorted JSON encoding matching the app's provider"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj the way jsonify does, for responses built once at import"""
+    return _dumps(obj) + b"\n"
+
 
 # Fake database
 users = {
@@ -16,78 +56,124 @@ users = {
     "admin": {"id": "admin", "name": "Admin", "email": "admin@example.com", "role": "admin", "balance": 999999}
 }
 
-# Rate limiting counter (simple demo)
-request_counts = {}
+# Encoded user rows served by the GET endpoints; create_user keeps it in sync
+users_json = {user_id: _json_bytes(user) for user_id, user in users.items()}
+
+# Inputs the deliberately weak checks below react to
+WEAK_PASSWORDS = frozenset({"password", "123456", "admin"})
+_SQLI_RE = re.compile(r"'|--|OR", re.IGNORECASE)
+
+# Fields create_user fills in when the request omits them
+USER_DEFAULTS = {
+    "name": "Unknown",
+    "email": "unknown@example.com",
+    "role": "user",
+    "isAdmin": False,
+    "balance": 0,
+}
+_EMPTY_BODY = {}  # shared fallback, never mutated
+
+# Rate limiting counter (simple demo); next() on itertools.count is atomic
+# under the GIL, so waitress worker threads can share it without a lock
+_next_request_number = count(1).__next__
+
+# Constant response bodies, serialized once
+HOME_RESPONSE = _json_bytes({
+    "message": "Test API Server",
+    "version": "1.0.0",
+    "endpoints": [
+        "/api/user/<id>",
+        "/api/users",
+        "/api/admin",
+        "/api/login"
+    ]
+})
+
+API_DOCS_RESPONSE = _json_bytes({
+    "swagger": "2.0",
+    "info": {
+        "title": "Test API",
+        "version": "1.0.0"
+    },
+    "paths": {
+        "/api/user/{id}": {
+            "get": {"summary": "Get user by ID"}
+        },
+        "/api/admin": {
+            "get": {"summary": "Admin panel (should be protected!)"}
+        }
+    }
+})
+
+USER_NOT_FOUND_RESPONSE = _json_bytes({"error": "User not found"})
+INVALID_CREDENTIALS_RESPONSE = _json_bytes({"error": "Invalid credentials"})
+
+
+def _json_body() -> dict:
+    """Parsed JSON object from the request, or an empty dict for anything else"""
+    data = request.get_json(silent=True, cache=False)
+    return data if isinstance(data, dict) else _EMPTY_BODY
 
 
 @app.route('/')
 def home():
-    return jsonify({
-        "message": "Test API Server",
-        "version": "1.0.0",
-        "endpoints": [
-            "/api/user/<id>",
-            "/api/users",
-            "/api/admin",
-            "/api/login"
-        ]
-    })
+    return Response(HOME_RESPONSE, mimetype="application/json")
 
 
 # VULNERABILITY: Broken Object Level Authorization
 @app.route('/api/user/<user_id>', methods=['GET'])
 def get_user(user_id):
     """BOLA vulnerability - no authorization check"""
-    if user_id in users:
-        return jsonify(users[user_id])
-    return jsonify({"error": "User not found"}), 404
+    body = users_json.get(user_id)
+    if body is not None:
+        return Response(body, mimetype="application/json")
+    return Response(USER_NOT_FOUND_RESPONSE, status=404, mimetype="application/json")
 
 
 # VULNERABILITY: Missing authentication
 @app.route('/api/admin', methods=['GET'])
 def admin_panel():
     """Missing authentication on admin endpoint"""
-    return jsonify({
-        "message": "Admin panel",
-        "users": users,
-        "sensitive_data": "This should be protected!"
-    })
+    # Snapshot the items so a concurrent create_user can't resize the dict mid-stream
+    entries = list(users_json.items())
+
+    def generate():
+        yield b'{"message":"Admin panel","sensitive_data":"This should be protected!","users":{'
+        for i, (user_id, body) in enumerate(entries):
+            # Drop the row's trailing newline inside the envelope
+            yield (b"," if i else b"") + _dumps(user_id) + b":" + body[:-1]
+        yield b"}}\n"
+
+    return Response(generate(), mimetype="application/json")
 
 
 # VULNERABILITY: Weak authentication
 @app.route('/api/login', methods=['POST'])
 def login():
     """Accepts weak passwords"""
-    data = request.get_json() or {}
+    data = _json_body()
     username = data.get('username')
     password = data.get('password')
     
     # Accepts weak passwords
-    if username == "admin" and password in ["password", "123456", "admin"]:
+    if username == "admin" and isinstance(password, str) and password in WEAK_PASSWORDS:
         return jsonify({
             "token": secrets.token_hex(16),
             "message": "Login successful"
         })
     
-    return jsonify({"error": "Invalid credentials"}), 401
+    return Response(INVALID_CREDENTIALS_RESPONSE, status=401, mimetype="application/json")
 
 
 # VULNERABILITY: Mass assignment
 @app.route('/api/users', methods=['POST'])
 def create_user():
     """Mass assignment vulnerability - accepts any fields"""
-    data = request.get_json() or {}
-    
-    # Accepts isAdmin, role, balance without validation
-    new_user = {
-        "id": str(len(users) + 1),
-        "name": data.get('name', 'Unknown'),
-        "email": data.get('email', 'unknown@example.com'),
-        "role": data.get('role', 'user'),  # Should be restricted!
-        "isAdmin": data.get('isAdmin', False),  # Should be restricted!
-        "balance": data.get('balance', 0)  # Should be restricted!
-    }
+    # Accepts isAdmin, role, balance (and anything else) without validation
+    new_user = USER_DEFAULTS | _json_body()
+    new_user["id"] = str(len(users) + 1)
     
+    users_json[new_user['id']] = _json_bytes(new_user)
     users[new_user['id']] = new_user
     return jsonify(new_user), 201
 
@@ -96,7 +182,7 @@ def create_user():
 @app.route('/api/unlimited', methods=['GET'])
 def unlimited_endpoint():
     """No rate limiting - vulnerable to abuse"""
-    return jsonify({"message": "Request processed", "count": len(request_counts)})
+    return jsonify({"message": "Request processed", "count": _next_request_number()})
 
 
 # VULNERABILITY: SQL Injection (simulated)
@@ -106,7 +192,7 @@ def search():
     query = request.args.get('q', '')
     
     # Simulated SQL error
-    if "'" in query or "--" in query or "OR" in query.upper():
+    if _SQLI_RE.search(query):
         return jsonify({
             "error": "SQL syntax error near '" + query + "'",
             "message": "sqlite3.OperationalError: unrecognized token"
@@ -127,21 +213,7 @@ def add_headers(response):
 @app.route('/api-docs', methods=['GET'])
 def api_docs():
     """Publicly accessible API documentation"""
-    return jsonify({
-        "swagger": "2.0",
-        "info": {
-            "title": "Test API",
-            "version": "1.0.0"
-        },
-        "paths": {
-            "/api/user/{id}": {
-                "get": {"summary": "Get user by ID"}
-            },
-            "/api/admin": {
-                "get": {"summary": "Admin panel (should be protected!)"}
-            }
-        }
-    })
+    return Response(API_DOCS_RESPONSE, mimetype="application/json")
 
 
 if __name__ == '__main__':
@@ -166,4 +238,7 @@ Use this server with the security tester:
 python3 main.py
 Target: http://localhost:5000
     """)
-    app.run(debug=True, port=5000)
\ No newline at end of file
+    if serve is not None:
+        serve(app, host="127.0.0.1", port=5000, threads=8)
+    else:
+        app.run(port=5000, threaded=True)
\ No newline at end of file
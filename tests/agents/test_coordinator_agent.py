@@ -1,12 +1,12 @@
 """
 Unit tests for CoordinatorAgent
-Tests use mocked Azure OpenAI calls — no real Azure credentials needed.
+Tests use mocked (async) Azure OpenAI calls — no real Azure credentials needed.
 """
 import asyncio
 import json
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, patch, AsyncMock
+from unittest.mock import ANY, MagicMock, patch, AsyncMock
 
 import pytest
 
@@ -48,15 +48,61 @@ MOCK_SCAN_PLAN = {
 }
 
 
-def _make_mock_response(content: dict) -> MagicMock:
-    """Build a mock that looks like an OpenAI chat completion response."""
-    msg = MagicMock()
-    msg.content = json.dumps(content)
-    choice = MagicMock()
-    choice.message = msg
-    response = MagicMock()
-    response.choices = [choice]
-    return response
+def _make_chunk(content=None, usage=None, finish_reason=None) -> MagicMock:
+    """Build a mock that looks like one streamed chat completion chunk."""
+    chunk = MagicMock()
+    chunk.usage = usage
+    if content is None:
+        chunk.choices = []
+    else:
+        choice = MagicMock()
+        choice.delta.content = content
+        choice.finish_reason = finish_reason
+        chunk.choices = [choice]
+    return chunk
+
+
+class _MockStream(list):
+    """List of chunks that can be consumed with ``async for``."""
+
+    async def __aiter__(self):
+        for chunk in self:
+            yield chunk
+
+
+def _make_mock_client() -> MagicMock:
+    """Build a mock AsyncAzureOpenAI client with an awaitable create()."""
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock()
+    return client
+
+
+def _make_mock_response(content, finish_reason: str = "stop") -> "_MockStream":
+    """Build a mock streamed chat completion: content split over chunks, then usage."""
+    text = content if isinstance(content, str) else json.dumps(content)
+    middle = len(text) // 2
+    usage = MagicMock(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+    return _MockStream([
+        _make_chunk(),  # Azure prompt-filter chunk carries no choices
+        _make_chunk(text[:middle]),
+        _make_chunk(text[middle:], finish_reason=finish_reason),
+        _make_chunk(usage=usage),
+    ])
+
+
+def _route_by_prompt(analysis: dict, plan: dict):
+    """
+    side_effect that answers by call type rather than call order.
+
+    plan_scan() issues the analysis and (speculative) planning calls
+    concurrently, so their order is not fixed.
+    """
+    def _create(**kwargs):
+        system = kwargs["messages"][0]["content"]
+        if "planning" in system:
+            return _make_mock_response(plan)
+        return _make_mock_response(analysis)
+    return _create
 
 
 # ─── Tests ───────────────────────────────────────────────────────────────────
@@ -64,7 +110,7 @@ def _make_mock_response(content: dict) -> MagicMock:
 class TestCoordinatorAgentInit:
     """Tests for CoordinatorAgent initialization."""
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -78,11 +124,65 @@ class TestCoordinatorAgentInit:
         mock_azure.assert_called_once_with(
             api_key="test-key",
             api_version="2024-02-15-preview",
-            azure_endpoint="https://test.openai.azure.com/"
+            azure_endpoint="https://test.openai.azure.com/",
+            max_retries=0,
+            http_client=ANY
         )
         assert agent.deployment == "gpt-4o-mini"
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_agents_on_one_event_loop_share_a_client(self, mock_azure):
+        from src.agents.coordinator_agent import CoordinatorAgent
+        mock_azure.side_effect = lambda **kwargs: MagicMock()
+
+        async def make_pair():
+            return CoordinatorAgent(), CoordinatorAgent()
+
+        first, second = asyncio.run(make_pair())
+        third, _ = asyncio.run(make_pair())
+
+        assert first.client is second.client
+        assert third.client is not first.client
+        assert mock_azure.call_count == 2
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_shared_clients_are_dropped_with_their_loop(self, mock_azure):
+        import gc
+        from src.agents import coordinator_agent
+        mock_azure.side_effect = lambda **kwargs: MagicMock()
+
+        async def make_agent():
+            coordinator_agent.CoordinatorAgent()
+            return len(coordinator_agent._SHARED_CLIENTS)
+
+        assert asyncio.run(make_agent()) >= 1
+        gc.collect()
+        assert len(coordinator_agent._SHARED_CLIENTS) == 0
+
+    @patch("src.agents.coordinator_agent.DefaultAsyncHttpxClient")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    def test_http_client_uses_pool_limits_and_timeouts(self, mock_azure, mock_http):
+        from src.agents.coordinator_agent import CoordinatorAgent, HTTP_LIMITS, HTTP_TIMEOUT
+        CoordinatorAgent()
+
+        mock_http.assert_called_once_with(http2=ANY, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        assert HTTP_LIMITS.max_keepalive_connections == 20
+        assert HTTP_LIMITS.max_connections == 50
+        assert HTTP_TIMEOUT.connect == 5 and HTTP_TIMEOUT.read == 60
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {}, clear=True)
     def test_init_with_missing_env_vars(self, mock_azure):
         """Agent should still initialize even with missing env vars (fail at call time)."""
@@ -94,7 +194,7 @@ class TestCoordinatorAgentInit:
 class TestAnalyzeApi:
     """Tests for CoordinatorAgent.analyze_api()"""
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -102,7 +202,7 @@ class TestAnalyzeApi:
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
     def test_analyze_api_returns_dict(self, mock_azure_cls):
-        mock_client = MagicMock()
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_ANALYSIS)
 
@@ -115,7 +215,7 @@ class TestAnalyzeApi:
         assert result["auth_method"] == "None"
         assert "risk_areas" in result
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -123,7 +223,7 @@ class TestAnalyzeApi:
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
     def test_analyze_api_passes_headers(self, mock_azure_cls):
-        mock_client = MagicMock()
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_ANALYSIS)
 
@@ -137,11 +237,33 @@ class TestAnalyzeApi:
         user_content = call_args[1]["messages"][1]["content"]
         assert "Authorization" in user_content
 
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_analyze_api_streams_and_records_usage(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_ANALYSIS)
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        kwargs = mock_client.chat.completions.create.call_args[1]
+        assert kwargs["stream"] is True
+        assert kwargs["stream_options"] == {"include_usage": True}
+        assert result == MOCK_ANALYSIS
+        assert agent.usage == {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+
 
 class TestCreateScanPlan:
     """Tests for CoordinatorAgent.create_scan_plan()"""
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -149,7 +271,7 @@ class TestCreateScanPlan:
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
     def test_create_scan_plan_returns_dict(self, mock_azure_cls):
-        mock_client = MagicMock()
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_SCAN_PLAN)
 
@@ -163,7 +285,7 @@ class TestCreateScanPlan:
         assert isinstance(result["priority_tests"], list)
         assert result["estimated_duration_minutes"] == 12
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -171,7 +293,7 @@ class TestCreateScanPlan:
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
     def test_create_scan_plan_includes_analysis_context(self, mock_azure_cls):
-        mock_client = MagicMock()
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_SCAN_PLAN)
 
@@ -183,26 +305,367 @@ class TestCreateScanPlan:
         user_content = call_args[1]["messages"][1]["content"]
         assert "Medium" in user_content  # data_sensitivity from MOCK_ANALYSIS
 
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_create_scan_plan_puts_static_prefix_first(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_SCAN_PLAN)
 
-class TestPlanScan:
-    """Tests for CoordinatorAgent.plan_scan() — full end-to-end (mocked)."""
+        from src.agents.coordinator_agent import CoordinatorAgent, STATIC_PROMPT_PREFIX
+        agent = CoordinatorAgent()
+        asyncio.run(agent.create_scan_plan(MOCK_ANALYSIS))
+
+        kwargs = mock_client.chat.completions.create.call_args[1]
+        assert kwargs["messages"][1]["content"].startswith(STATIC_PROMPT_PREFIX)
+        assert kwargs["extra_body"]["prompt_cache_key"]
+        assert kwargs["max_tokens"] == 1200
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
         "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
-    def test_plan_scan_returns_complete_result(self, mock_azure_cls, capsys):
-        mock_client = MagicMock()
+    def test_create_scan_plan_validates_response_shape(self, mock_azure_cls):
+        from pydantic import ValidationError
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+
+        mock_client.chat.completions.create.return_value = _make_mock_response({
+            "priority_tests": [{"test_id": "API1", "test_name": "BOLA", "priority": "HIGH"}]
+        })
+        plan = asyncio.run(agent.create_scan_plan(MOCK_ANALYSIS))
+        assert plan["priority_tests"][0]["reason"] == ""
+        assert plan["recommended_order"] == []
+        assert plan["estimated_duration_minutes"] == 0
+
+        mock_client.chat.completions.create.return_value = _make_mock_response({"tests": []})
+        with pytest.raises(ValidationError):
+            asyncio.run(agent.create_scan_plan({"auth_method": "Bearer"}))
+
+    @pytest.mark.parametrize("duration, expected", [
+        (15, 15), (15.6, 16), ("15", 15), ("10-15", 15), ("about 20 minutes", 20),
+        ("unknown", 0), (None, 0),
+    ])
+    def test_scan_plan_coerces_estimated_duration(self, duration, expected):
+        from src.agents.coordinator_agent import _parse_scan_plan
+        plan = _parse_scan_plan(json.dumps({
+            "priority_tests": [], "estimated_duration_minutes": duration
+        }))
+        assert plan["estimated_duration_minutes"] == expected
+
+
+class TestAnalyzeApis:
+    """Tests for CoordinatorAgent.analyze_apis() / plan_scans() batching."""
+
+    TARGETS = [
+        ("http://localhost:5000/api/users", None),
+        ("http://localhost:5000/api/admin", {"Authorization": "Bearer t"}),
+    ]
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_analyze_apis_uses_one_request(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        second = dict(MOCK_ANALYSIS, auth_method="Bearer Token")
+        mock_client.chat.completions.create.return_value = _make_mock_response(
+            {"analyses": [MOCK_ANALYSIS, second]}
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_apis(self.TARGETS))
+
+        assert result == [MOCK_ANALYSIS, second]
+        assert mock_client.chat.completions.create.call_count == 1
+        user_content = mock_client.chat.completions.create.call_args[1]["messages"][1]["content"]
+        assert "/api/users" in user_content and "/api/admin" in user_content
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_large_batches_are_split(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+
+        def _create(**kwargs):
+            endpoints = json.loads(kwargs["messages"][1]["content"].rsplit("\n", 1)[1])
+            return _make_mock_response(
+                {"analyses": [dict(MOCK_ANALYSIS, domain=e["url"]) for e in endpoints]}
+            )
+        mock_client.chat.completions.create.side_effect = _create
+
+        from src.agents.coordinator_agent import (
+            CoordinatorAgent, ANALYSIS_BATCH_SIZE, MAX_OUTPUT_TOKENS
+        )
+        targets = [(f"http://localhost:5000/api/item/{i}", None) for i in range(25)]
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_apis(targets))
+
+        assert [r["domain"] for r in result] == [url for url, _ in targets]
+        calls = mock_client.chat.completions.create.call_args_list
+        assert len(calls) == -(-len(targets) // ANALYSIS_BATCH_SIZE)
+        assert all(c[1]["max_tokens"] <= MAX_OUTPUT_TOKENS for c in calls)
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_analyze_apis_falls_back_on_short_batch(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+
+        def _create(**kwargs):
+            if "analyses" in kwargs["messages"][1]["content"]:
+                return _make_mock_response({"analyses": [MOCK_ANALYSIS]})
+            return _make_mock_response(MOCK_ANALYSIS)
+        mock_client.chat.completions.create.side_effect = _create
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_apis(self.TARGETS))
+
+        assert result == [MOCK_ANALYSIS, MOCK_ANALYSIS]
+        assert mock_client.chat.completions.create.call_count == 3
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scans_returns_result_per_target(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            {"analyses": [MOCK_ANALYSIS, MOCK_ANALYSIS]}, MOCK_SCAN_PLAN
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        results = asyncio.run(agent.plan_scans(self.TARGETS))
+
+        assert [r["target_url"] for r in results] == [u for u, _ in self.TARGETS]
+        assert results[1]["headers"] == {"Authorization": "Bearer t"}
+        assert all(r["scan_plan"] == MOCK_SCAN_PLAN for r in results)
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scans_bounds_concurrency_and_isolates_failures(self, mock_azure_cls):
+        mock_azure_cls.return_value = _make_mock_client()
+        targets = [(f"http://localhost:5000/api/{i}", None) for i in range(6)]
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        agent._analyze_batch = AsyncMock(
+            return_value=[dict(MOCK_ANALYSIS, domain=str(i)) for i in range(6)]
+        )
+        in_flight, peak = 0, 0
+
+        async def _plan(api_analysis):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if api_analysis["domain"] == "3":
+                raise RuntimeError("boom")
+            return MOCK_SCAN_PLAN
+        agent.create_scan_plan = _plan
+
+        results = asyncio.run(agent.plan_scans(targets, max_concurrency=2))
+
+        assert peak == 2
+        assert results[3]["error"] == "boom" and "scan_plan" not in results[3]
+        assert all(r["scan_plan"] == MOCK_SCAN_PLAN for i, r in enumerate(results) if i != 3)
+
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scans_bounds_analysis_and_isolates_its_failures(self, mock_azure_cls):
+        mock_azure_cls.return_value = _make_mock_client()
+        targets = [(f"http://localhost:5000/api/{i}", None) for i in range(4)]
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        # Batched reply is short, so every endpoint is analyzed on its own
+        agent._complete = AsyncMock(side_effect=ValueError("short batch"))
+        in_flight, peak = 0, 0
+
+        async def _analyze(url, headers=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if url.endswith("/1"):
+                raise RuntimeError("analysis down")
+            return dict(MOCK_ANALYSIS, domain=url)
+        agent.analyze_api = _analyze
+        agent.create_scan_plan = AsyncMock(return_value=MOCK_SCAN_PLAN)
+
+        results = asyncio.run(agent.plan_scans(targets, max_concurrency=2))
+
+        assert peak == 2
+        assert results[1]["error"] == "analysis down" and "scan_plan" not in results[1]
+        assert all(r["scan_plan"] == MOCK_SCAN_PLAN for i, r in enumerate(results) if i != 1)
+        assert agent.create_scan_plan.await_count == 3
+
+
+class TestRateLimitRetry:
+    """Tests for the 429 backoff around completion requests."""
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_rate_limited_request_is_retried(self, mock_azure_cls):
+        tenacity = pytest.importorskip("tenacity")
+        from openai import RateLimitError
+        from src.agents.coordinator_agent import CoordinatorAgent
+
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        rate_limited = RateLimitError.__new__(RateLimitError)
+        mock_client.chat.completions.create.side_effect = [
+            rate_limited,
+            _make_mock_response(MOCK_ANALYSIS),
+        ]
+
+        agent = CoordinatorAgent()
+        with patch.object(CoordinatorAgent._create_stream.retry, "wait", tenacity.wait_none()):
+            result = asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert result == MOCK_ANALYSIS
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_connection_error_is_retried(self, mock_azure_cls):
+        tenacity = pytest.importorskip("tenacity")
+        from openai import APIConnectionError
+        from src.agents.coordinator_agent import CoordinatorAgent
+
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
-        # First call → analyze_api, second call → create_scan_plan
         mock_client.chat.completions.create.side_effect = [
+            APIConnectionError.__new__(APIConnectionError),
             _make_mock_response(MOCK_ANALYSIS),
-            _make_mock_response(MOCK_SCAN_PLAN),
         ]
 
+        agent = CoordinatorAgent()
+        with patch.object(CoordinatorAgent._create_stream.retry, "wait", tenacity.wait_none()):
+            result = asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert result == MOCK_ANALYSIS
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_rate_limited_request_is_sent_once_per_retry(self):
+        """SDK retries are off, so the transport sees exactly one request per attempt."""
+        tenacity = pytest.importorskip("tenacity")
+        try:
+            import httpx2 as httpx
+        except ImportError:
+            httpx = pytest.importorskip("httpx")
+        from openai import DefaultAsyncHttpxClient, RateLimitError
+        from src.agents.coordinator_agent import CoordinatorAgent
+
+        attempts = 0
+
+        def _handler(request):
+            nonlocal attempts
+            attempts += 1
+            return httpx.Response(429, json={"error": {"message": "Too many requests"}})
+
+        def _client(**kwargs):
+            return DefaultAsyncHttpxClient(transport=httpx.MockTransport(_handler))
+
+        with patch("src.agents.coordinator_agent.DefaultAsyncHttpxClient", _client):
+            agent = CoordinatorAgent()
+        with patch.object(CoordinatorAgent._create_stream.retry, "wait", tenacity.wait_none()):
+            with pytest.raises(RateLimitError):
+                asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert attempts == 5
+
+    def test_retry_after_headers_are_honoured(self):
+        from src.agents.coordinator_agent import _retry_after_seconds
+
+        def error(headers):
+            return MagicMock(response=MagicMock(headers=headers))
+
+        assert _retry_after_seconds(error({"retry-after-ms": "1500"})) == 1.5
+        assert _retry_after_seconds(error({"retry-after": "7"})) == 7.0
+        assert _retry_after_seconds(error({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"})) is None
+        assert _retry_after_seconds(error({})) is None
+        assert _retry_after_seconds(None) is None
+
+
+class TestPlanScan:
+    """Tests for CoordinatorAgent.plan_scan() — full end-to-end (mocked)."""
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_returns_complete_result(self, mock_azure_cls, capsys):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            MOCK_ANALYSIS, MOCK_SCAN_PLAN
+        )
+
         from src.agents.coordinator_agent import CoordinatorAgent
         agent = CoordinatorAgent()
         result = asyncio.run(agent.plan_scan("http://localhost:5000"))
@@ -212,7 +675,7 @@ class TestPlanScan:
         assert result["target_url"] == "http://localhost:5000"
         assert result["headers"] == {}
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
@@ -220,37 +683,337 @@ class TestPlanScan:
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
     def test_plan_scan_calls_openai_twice(self, mock_azure_cls):
-        mock_client = MagicMock()
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            MOCK_ANALYSIS, MOCK_SCAN_PLAN
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        asyncio.run(agent.plan_scan("http://localhost:5000"))
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_preserves_headers(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            MOCK_ANALYSIS, MOCK_SCAN_PLAN
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        headers = {"Authorization": "Bearer abc123"}
+        result = asyncio.run(agent.plan_scan("http://localhost:5000", headers=headers))
+
+        assert result["headers"] == headers
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_keeps_speculative_plan_when_analysis_agrees(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            MOCK_ANALYSIS, MOCK_SCAN_PLAN
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.plan_scan("http://localhost:5000"))
+
+        # Heuristic guess (no auth, Medium) matches MOCK_ANALYSIS: no re-plan
+        plan_calls = [
+            c for c in mock_client.chat.completions.create.call_args_list
+            if "planning" in c[1]["messages"][0]["content"]
+        ]
+        assert len(plan_calls) == 1
+        assert "Heuristic" in plan_calls[0][1]["messages"][1]["content"]
+        assert result["scan_plan"] == MOCK_SCAN_PLAN
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_replans_when_analysis_diverges(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        analysis = dict(MOCK_ANALYSIS, data_sensitivity="Critical", domain="Payments")
+        mock_client.chat.completions.create.side_effect = _route_by_prompt(
+            analysis, MOCK_SCAN_PLAN
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.plan_scan("http://localhost:5000"))
+
+        # The speculative plan may be cancelled before it is sent; the plan
+        # actually used must come from the real analysis
+        last_call = mock_client.chat.completions.create.call_args_list[-1]
+        assert "planning" in last_call[1]["messages"][0]["content"]
+        assert "Payments" in last_call[1]["messages"][1]["content"]
+        assert result["api_analysis"] == analysis
+
+    @staticmethod
+    def _failing_speculation(analysis):
+        """side_effect whose speculative (heuristic) plan fails before the analysis returns"""
+        async def _create(**kwargs):
+            system, user = (m["content"] for m in kwargs["messages"])
+            if "planning" in system:
+                if "Heuristic" in user:
+                    raise RuntimeError("speculative plan failed")
+                return _make_mock_response(MOCK_SCAN_PLAN)
+            await asyncio.sleep(0.01)
+            return _make_mock_response(analysis)
+        return _create
+
+    @staticmethod
+    def _run_recording_loop_errors(coro):
+        """Run coro, returning its result and anything reported to the loop's exception handler"""
+        import gc
+        errors = []
+
+        async def _main():
+            asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+            result = await coro
+            gc.collect()
+            return result
+
+        return asyncio.run(_main()), errors
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_replans_when_matching_speculation_fails(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = self._failing_speculation(MOCK_ANALYSIS)
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result, errors = self._run_recording_loop_errors(agent.plan_scan("http://localhost:5000"))
+
+        assert result["scan_plan"] == MOCK_SCAN_PLAN
+        assert errors == []
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_plan_scan_reaps_failed_mismatched_speculation(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        analysis = dict(MOCK_ANALYSIS, data_sensitivity="Critical", domain="Payments")
+        mock_client.chat.completions.create.side_effect = self._failing_speculation(analysis)
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result, errors = self._run_recording_loop_errors(agent.plan_scan("http://localhost:5000"))
+
+        assert result["scan_plan"] == MOCK_SCAN_PLAN
+        assert result["api_analysis"] == analysis
+        assert errors == []
+
+
+class TestResponseCache:
+    """Tests for the exact and semantic LLM response caches."""
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_identical_request_is_served_from_cache(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = lambda **kw: _make_mock_response(MOCK_ANALYSIS)
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        first = asyncio.run(agent.analyze_api("http://localhost:5000"))
+        second = asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert first == second == MOCK_ANALYSIS
+        assert first is not second  # callers get independent dicts
+        assert mock_client.chat.completions.create.call_count == 1
+        stats = agent.cache_stats()
+        assert (stats["exact_hits"], stats["misses"], stats["exact_entries"]) == (1, 1, 1)
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_unparseable_reply_is_not_cached(self, mock_azure_cls):
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.side_effect = [
+            _make_mock_response('{"api_type": "RE'),
             _make_mock_response(MOCK_ANALYSIS),
-            _make_mock_response(MOCK_SCAN_PLAN),
         ]
 
         from src.agents.coordinator_agent import CoordinatorAgent
         agent = CoordinatorAgent()
-        asyncio.run(agent.plan_scan("http://localhost:5000"))
+        with pytest.raises(ValueError):
+            asyncio.run(agent.analyze_api("http://x"))
+        result = asyncio.run(agent.analyze_api("http://x"))
 
+        assert result == MOCK_ANALYSIS
         assert mock_client.chat.completions.create.call_count == 2
+        assert agent.cache_stats()["exact_hits"] == 0
 
-    @patch("src.agents.coordinator_agent.AzureOpenAI")
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
     @patch.dict("os.environ", {
         "AZURE_OPENAI_API_KEY": "test-key",
         "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
         "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
         "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
     })
-    def test_plan_scan_preserves_headers(self, mock_azure_cls):
-        mock_client = MagicMock()
+    def test_truncated_reply_is_retried_with_higher_limit(self, mock_azure_cls):
+        mock_client = _make_mock_client()
         mock_azure_cls.return_value = mock_client
         mock_client.chat.completions.create.side_effect = [
+            _make_mock_response('{"api_type": "RE', finish_reason="length"),
             _make_mock_response(MOCK_ANALYSIS),
-            _make_mock_response(MOCK_SCAN_PLAN),
         ]
 
+        from src.agents.coordinator_agent import CoordinatorAgent, ANALYSIS_MAX_TOKENS
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_api("http://x"))
+
+        assert result == MOCK_ANALYSIS
+        limits = [c[1]["max_tokens"] for c in mock_client.chat.completions.create.call_args_list]
+        assert limits == [ANALYSIS_MAX_TOKENS, ANALYSIS_MAX_TOKENS * 2]
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_persistently_truncated_reply_raises_clear_error(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = lambda **kw: _make_mock_response(
+            '{"priority_tests": [', finish_reason="length"
+        )
+
+        from src.agents.coordinator_agent import CoordinatorAgent, CompletionTruncatedError
+        agent = CoordinatorAgent()
+        with pytest.raises(CompletionTruncatedError):
+            asyncio.run(agent.create_scan_plan(MOCK_ANALYSIS))
+
+        assert mock_client.chat.completions.create.call_count == 2
+        assert agent.cache_stats()["exact_entries"] == 0
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini"
+    })
+    def test_expired_entries_are_refetched(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = lambda **kw: _make_mock_response(MOCK_ANALYSIS)
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent(cache_ttl=0)
+        asyncio.run(agent.analyze_api("http://localhost:5000"))
+        asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini",
+        "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": "text-embedding-3-small"
+    })
+    def test_similar_endpoint_hits_semantic_cache(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.side_effect = lambda **kw: _make_mock_response(MOCK_ANALYSIS)
+        embedding = MagicMock()
+        embedding.data = [MagicMock(embedding=[0.6, 0.8, 0.0])]
+        mock_client.embeddings.create = AsyncMock(return_value=embedding)
+
         from src.agents.coordinator_agent import CoordinatorAgent
         agent = CoordinatorAgent()
-        headers = {"Authorization": "Bearer abc123"}
-        result = asyncio.run(agent.plan_scan("http://localhost:5000", headers=headers))
+        asyncio.run(agent.analyze_api("http://localhost:5000/api/users"))
+        result = asyncio.run(agent.analyze_api("http://localhost:5000/api/users/"))
 
-        assert result["headers"] == headers
+        assert result == MOCK_ANALYSIS
+        assert mock_client.chat.completions.create.call_count == 1
+        assert agent.cache_stats()["semantic_hits"] == 1
+
+    @patch("src.agents.coordinator_agent.AsyncAzureOpenAI")
+    @patch.dict("os.environ", {
+        "AZURE_OPENAI_API_KEY": "test-key",
+        "AZURE_OPENAI_API_VERSION": "2024-02-15-preview",
+        "AZURE_OPENAI_ENDPOINT": "https://test.openai.azure.com/",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "gpt-4o-mini",
+        "AZURE_OPENAI_EMBEDDING_DEPLOYMENT": "missing-deployment"
+    })
+    def test_embedding_failure_falls_back_to_llm(self, mock_azure_cls):
+        mock_client = _make_mock_client()
+        mock_azure_cls.return_value = mock_client
+        mock_client.chat.completions.create.return_value = _make_mock_response(MOCK_ANALYSIS)
+        mock_client.embeddings.create = AsyncMock(side_effect=RuntimeError("404"))
+
+        from src.agents.coordinator_agent import CoordinatorAgent
+        agent = CoordinatorAgent()
+        result = asyncio.run(agent.analyze_api("http://localhost:5000"))
+
+        assert result == MOCK_ANALYSIS
+        assert agent.cache_stats()["semantic_entries"] == 0
+
+
+class TestHeuristicAnalysis:
+    """Tests for the local pre-analysis used for speculative planning."""
+
+    def test_sniffs_auth_scheme_from_headers(self):
+        from src.agents.coordinator_agent import CoordinatorAgent
+        guess = CoordinatorAgent._heuristic_analysis
+
+        assert guess("http://x", {"Authorization": "Bearer t"})["auth_method"] == "Bearer Token"
+        assert guess("http://x", {"authorization": "Basic dTpw"})["auth_method"] == "Basic"
+        assert guess("http://x", {"X-API-Key": "k"})["auth_method"] == "API Key"
+        assert guess("http://x")["auth_method"] == "None"
+
+    def test_sensitive_paths_raise_data_sensitivity(self):
+        from src.agents.coordinator_agent import CoordinatorAgent
+        guess = CoordinatorAgent._heuristic_analysis
+
+        assert guess("https://api.example.com/v1/payments")["data_sensitivity"] == "High"
+        assert guess("http://localhost:5000")["data_sensitivity"] == "Medium"
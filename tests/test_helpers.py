@@ -0,0 +1,149 @@
+"""
+Unit tests for helpers.py — URL, header, IP and risk-scoring helpers.
+Pure functions; no network calls are made.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class TestParseUrl:
+    """Tests for the memoised urlparse wrapper."""
+
+    def test_ipv6_host_and_port(self):
+        from helpers import parse_url
+        parsed = parse_url("http://[::1]:8080/api/users?id=1")
+
+        assert parsed.hostname == "::1"
+        assert parsed.port == 8080
+        assert parsed.netloc == "[::1]:8080"
+        assert parsed.path == "/api/users"
+
+    def test_portless_url(self):
+        from helpers import parse_url, extract_base_url
+        parsed = parse_url("https://api.example.com/v1")
+
+        assert parsed.port is None
+        assert parsed.hostname == "api.example.com"
+        assert extract_base_url("https://api.example.com/v1") == "https://api.example.com"
+
+    def test_repeated_url_reuses_result(self):
+        from helpers import parse_url
+        assert parse_url("http://localhost:5000/") is parse_url("http://localhost:5000/")
+
+    def test_malformed_ipv6_raises_and_is_not_cached(self):
+        from helpers import parse_url, validate_url
+        with pytest.raises(ValueError):
+            parse_url("http://[::1/api")
+        with pytest.raises(ValueError):
+            parse_url("http://[::1/api")
+        assert validate_url("http://[::1/api") is False
+
+    def test_url_without_scheme_is_invalid(self):
+        from helpers import parse_url, validate_url
+        assert parse_url("not-a-url").scheme == ""
+        assert validate_url("not-a-url") is False
+        assert validate_url("http://[::1]:8080/") is True
+
+
+class TestParseHeaderLine:
+    """Tests for 'Key: Value' header parsing."""
+
+    @pytest.mark.parametrize("line, expected", [
+        ("Authorization: Bearer abc", ("Authorization", "Bearer abc")),
+        ("  X-API-Key :  secret  ", ("X-API-Key", "secret")),
+        ("X-Forwarded-For: 10.0.0.1:8080", ("X-Forwarded-For", "10.0.0.1:8080")),
+    ])
+    def test_valid_lines(self, line, expected):
+        from helpers import parse_header_line
+        assert parse_header_line(line) == expected
+
+    @pytest.mark.parametrize("line", [
+        "",
+        "no colon here",
+        ": value without key",
+        "Key:",
+        "Key:    ",
+        "Bad Key: value",
+    ])
+    def test_malformed_lines(self, line):
+        from helpers import parse_header_line
+        assert parse_header_line(line) is None
+
+
+class TestIsInternalIp:
+    """Tests for internal address detection, single and batched."""
+
+    ADDRESSES = [
+        "127.0.0.1", "8.8.8.8", "10.1.2.3", "172.15.0.1", "172.16.0.1",
+        "172.31.255.255", "172.32.0.1", "192.168.1.1", "localhost",
+        "localhost.example.com", "::1", "::2",
+    ]
+
+    def test_batch_matches_single_checks_in_order(self):
+        from helpers import is_internal_ip, is_internal_ip_batch
+        assert is_internal_ip_batch(self.ADDRESSES) == [
+            ip for ip in self.ADDRESSES if is_internal_ip(ip)
+        ]
+
+    def test_expected_internal_addresses(self):
+        from helpers import is_internal_ip_batch
+        assert is_internal_ip_batch(self.ADDRESSES) == [
+            "127.0.0.1", "10.1.2.3", "172.16.0.1", "172.31.255.255",
+            "192.168.1.1", "localhost", "::1",
+        ]
+
+    def test_empty_batch(self):
+        from helpers import is_internal_ip_batch
+        assert is_internal_ip_batch([]) == []
+
+
+def _reference_risk_level(score):
+    """The if/elif ladder get_risk_level replaced."""
+    if score >= 75:
+        return "CRITICAL"
+    elif score >= 50:
+        return "HIGH"
+    elif score >= 25:
+        return "MEDIUM"
+    else:
+        return "LOW"
+
+
+class TestRiskScoring:
+    """Pins the bisect/weight-table scoring to the original results."""
+
+    @pytest.mark.parametrize("score, expected", [
+        (0, "LOW"), (24, "LOW"), (24.5, "LOW"),
+        (25, "MEDIUM"), (49, "MEDIUM"),
+        (50, "HIGH"), (74, "HIGH"),
+        (75, "CRITICAL"), (100, "CRITICAL"),
+        (-1, "LOW"),
+    ])
+    def test_risk_level_at_thresholds(self, score, expected):
+        from helpers import get_risk_level
+        assert get_risk_level(score) == expected
+        assert get_risk_level(score) == _reference_risk_level(score)
+
+    def test_risk_level_matches_reference_for_every_score(self):
+        from helpers import get_risk_level
+        for score in range(0, 101):
+            assert get_risk_level(score) == _reference_risk_level(score), score
+
+    @pytest.mark.parametrize("summary, expected", [
+        ({}, 0),
+        ({"critical": 1}, 25),
+        ({"high": 1}, 15),
+        ({"medium": 1}, 8),
+        ({"low": 1}, 3),
+        ({"critical": 1, "high": 1, "medium": 1, "low": 1}, 51),
+        ({"critical": 2, "high": 3, "medium": 5, "low": 2}, 100),  # capped
+        ({"info": 10, "passed": 3}, 0),
+    ])
+    def test_risk_score_weights(self, summary, expected):
+        from helpers import calculate_risk_score, SEVERITY_WEIGHTS
+        assert SEVERITY_WEIGHTS == {"critical": 25, "high": 15, "medium": 8, "low": 3}
+        assert calculate_risk_score(summary) == expected
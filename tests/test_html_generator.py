@@ -0,0 +1,65 @@
+"""
+Unit tests for html_generator.py — generate_html_report.
+Reports are written to pytest's tmp_path; no network calls are made.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def _session_data(results):
+    return {
+        "scan_id": "20250101_000000",
+        "target_url": "http://localhost:5000",
+        "duration": 1.5,
+        "summary": {
+            "total_tests": len(results),
+            "vulnerabilities_found": sum(r["status"] == "VULNERABLE" for r in results),
+            "passed": 0,
+            "critical": 0,
+            "high": sum(r.get("severity") == "HIGH" for r in results),
+            "medium": 0,
+            "low": 0,
+            "info": 0,
+        },
+        "results": results,
+    }
+
+
+class TestHtmlEscaping:
+    """User-supplied finding fields must not be emitted as raw markup."""
+
+    def test_vulnerability_fields_are_escaped(self, tmp_path):
+        from html_generator import generate_html_report
+        results = [{
+            "test": "Injection",
+            "status": "VULNERABLE",
+            "severity": "HIGH",
+            "description": "<script>alert(1)</script>",
+            "url": "http://x/?q=\"a\"&b='c'",
+            "evidence": "<b>row</b>",
+        }]
+        out = tmp_path / "report.html"
+        generate_html_report(_session_data(results), str(out))
+        html = out.read_text(encoding="utf-8")
+
+        assert "<script>alert(1)</script>" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+        assert "http://x/?q=&quot;a&quot;&amp;b=&#39;c&#39;" in html
+        assert "&lt;b&gt;row&lt;/b&gt;" in html
+
+    def test_missing_fields_fall_back_to_defaults(self, tmp_path):
+        from html_generator import generate_html_report
+        results = [
+            {"test": "BOLA", "status": "VULNERABLE", "severity": "HIGH"},
+            {"test": "Info", "status": "INFO", "description": "<i>note</i>"},
+        ]
+        out = tmp_path / "report.html"
+        generate_html_report(_session_data(results), str(out))
+        html = out.read_text(encoding="utf-8")
+
+        assert "No recommendation provided" in html
+        assert "<li>&lt;i&gt;note&lt;/i&gt;</li>" in html
@@ -0,0 +1,82 @@
+"""
+Unit tests for core/http_cache.py — CachedSession.
+The wrapped requests.Session is mocked; no network calls are made.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+class TestCachedSession:
+    """Tests for the shared LRU response cache."""
+
+    def setup_method(self):
+        from core.http_cache import CachedSession
+        self.inner = MagicMock()
+        self.inner.request.side_effect = lambda method, url, **kwargs: MagicMock(url=url)
+        self.cache = CachedSession(self.inner, maxsize=2)
+
+    def test_identical_get_is_sent_once(self):
+        first = self.cache.get("http://x/a", headers={"A": "1"})
+        second = self.cache.get("http://x/a", headers={"A": "1"})
+
+        assert first is second
+        assert self.inner.request.call_count == 1
+        assert (self.cache.hits, self.cache.misses) == (1, 1)
+
+    def test_headers_are_part_of_the_key(self):
+        self.cache.get("http://x/a", headers={"Authorization": "Bearer t"})
+        self.cache.get("http://x/a", headers={})
+
+        assert self.inner.request.call_count == 2
+
+    def test_cookies_are_part_of_the_key(self):
+        self.cache.get("http://x/a", cookies={"session": "admin"})
+        self.cache.get("http://x/a")
+
+        assert self.inner.request.call_count == 2
+
+    def test_post_is_not_cached(self):
+        self.cache.post("http://x/login", json={"username": "admin"})
+        self.cache.post("http://x/login", json={"username": "admin"})
+
+        assert self.inner.request.call_count == 2
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.cache.get("http://x/a")
+        self.cache.get("http://x/b")
+        self.cache.get("http://x/a")  # refresh a
+        self.cache.get("http://x/c")  # evicts b
+        self.cache.get("http://x/b")
+
+        assert self.inner.request.call_count == 4
+
+    def test_clear_drops_cached_responses(self):
+        self.cache.get("http://x/a")
+        self.cache.clear()
+        self.cache.get("http://x/a")
+
+        assert self.inner.request.call_count == 2
+        assert self.cache.hits == 0
+
+
+class TestResponseCacheOptOut:
+    """Tests that must observe every response bypass the cache."""
+
+    def test_rate_limiting_test_uses_uncached_session(self):
+        from core.http_cache import CachedSession
+        from tests.vulnerability_tests import RateLimitingTest, BOLATest
+
+        inner = MagicMock()
+        cache = CachedSession(inner)
+        cache.get = MagicMock()
+
+        RateLimitingTest(session=cache)._get("http://x/")
+        BOLATest(session=cache)._get("http://x/")
+
+        inner.get.assert_called_once()
+        cache.get.assert_called_once()
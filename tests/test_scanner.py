@@ -4,9 +4,11 @@ No live network calls are made; vulnerability tests are mocked.
 """
 import sys
 import json
+import asyncio
+import threading
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -86,6 +88,37 @@ class TestScanSession:
         assert session.summary["low"] == 1
         assert session.summary["vulnerabilities_found"] == 4
 
+    def test_add_results_buckets_by_status(self):
+        session = self.ScanSession("http://localhost:5000")
+        vuln = self._make_result("VULNERABLE", "HIGH")
+        info = self._make_result("INFO", "LOW")
+        session.add_results([vuln, info, self._make_result("PASSED", "LOW")])
+
+        assert session.vulnerabilities == [vuln]
+        assert session.info_items == [info]
+
+    def test_risk_score_tracks_summary(self):
+        from helpers import calculate_risk_score
+        session = self.ScanSession("http://localhost:5000")
+        session.add_results([
+            self._make_result("VULNERABLE", "CRITICAL"),
+            self._make_result("VULNERABLE", "MEDIUM"),
+            self._make_result("PASSED", "HIGH"),
+        ])
+        assert session.risk_score == calculate_risk_score(session.summary) == 33
+
+        session.add_results([self._make_result("VULNERABLE", "CRITICAL")] * 4)
+        assert session.risk_score == calculate_risk_score(session.summary) == 100
+
+    def test_add_results_normalizes_non_canonical_status(self):
+        session = self.ScanSession("http://localhost:5000")
+        # Strings built at runtime are not the interned constants the tests emit
+        status = "".join(["vulner", "able"])
+        session.add_results([self._make_result(status, "".join(["hi", "gh"]))])
+
+        assert session.summary["vulnerabilities_found"] == 1
+        assert session.summary["high"] == 1
+
     def test_add_multiple_batches(self):
         session = self.ScanSession("http://localhost:5000")
         session.add_results([self._make_result("VULNERABLE", "HIGH")])
@@ -124,9 +157,19 @@ class TestScanSession:
         assert "end_time" in d
         assert "duration" in d
         assert "summary" in d
+        assert d["risk_score"] == session.risk_score == 15
         assert "results" in d
         assert len(d["results"]) == 1
 
+    def test_to_dict_summary_is_plain_dict(self):
+        session = self.ScanSession("http://localhost:5000")
+        session.add_results([self._make_result("VULNERABLE", "LOW")])
+        summary = session.to_dict()["summary"]
+
+        assert isinstance(summary, dict)
+        assert summary["low"] == 1
+        assert session.summary.low == 1
+
     def test_to_dict_is_json_serializable(self):
         session = self.ScanSession("http://localhost:5000")
         session.add_results([self._make_result()])
@@ -235,6 +278,131 @@ class TestSecurityScanner:
         assert session.summary["vulnerabilities_found"] == 1
         assert session.summary["passed"] == 1
 
+    def test_run_scan_reuses_test_instances(self):
+        scanner = self.SecurityScanner()
+        mock_cls = self._make_mock_test_class(results=[])
+        config = {
+            "target_url": "http://localhost:5000",
+            "headers": {},
+            "selected_tests": [mock_cls]
+        }
+        scanner.run_scan(config)
+        scanner.run_scan(config)
+
+        assert mock_cls.call_count == 1
+        assert mock_cls.return_value.run.call_count == 2
+
+    def test_tests_share_scanner_http_session(self):
+        scanner = self.SecurityScanner()
+        mock_cls = self._make_mock_test_class(results=[])
+        scanner.run_scan({
+            "target_url": "http://localhost:5000",
+            "headers": {},
+            "selected_tests": [mock_cls]
+        })
+
+        mock_cls.assert_called_once_with(session=scanner.http_cache)
+        assert scanner.http_cache.uncached is scanner.http
+        for test_class in scanner.test_classes:
+            assert scanner._get_test(test_class).http is scanner.http_cache
+        scanner.close()
+
+    def test_shared_http_session_does_not_keep_cookies(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = (self.headers.get("Cookie") or "").encode()
+                self.send_response(200)
+                if self.path == "/login":
+                    self.send_header("Set-Cookie", "session=admin; Path=/")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        scanner = self.SecurityScanner()
+        try:
+            scanner.http.get(f"{base}/login")
+            echoed = scanner.http.get(f"{base}/whoami").text
+        finally:
+            scanner.close()
+            server.shutdown()
+            server.server_close()
+
+        assert echoed == ""
+        assert len(scanner.http.cookies) == 0
+
+    def test_run_scan_runs_tests_concurrently(self):
+        scanner = self.SecurityScanner()
+        passed = {
+            "test": "T", "category": "API1", "url": "http://x", "method": "GET",
+            "status": "PASSED", "severity": "INFO",
+            "description": "d", "evidence": "e", "recommendation": "r"
+        }
+        # Both tests must be in flight at once to get past the barrier
+        barrier = threading.Barrier(2, timeout=2)
+
+        def run(*args, **kwargs):
+            barrier.wait()
+            return [passed]
+
+        mock1 = self._make_mock_test_class()
+        mock2 = self._make_mock_test_class()
+        mock1.return_value.run.side_effect = run
+        mock2.return_value.run.side_effect = run
+        config = {
+            "target_url": "http://localhost:5000",
+            "headers": {},
+            "selected_tests": [mock1, mock2]
+        }
+        session = scanner.run_scan(config)
+
+        assert session.summary["total_tests"] == 2
+        assert session.summary["passed"] == 2
+
+    def test_run_scan_async_aggregates_results(self):
+        scanner = self.SecurityScanner()
+        vuln = {
+            "test": "T", "category": "API1", "url": "http://x", "method": "GET",
+            "status": "VULNERABLE", "severity": "CRITICAL",
+            "description": "d", "evidence": "e", "recommendation": "r"
+        }
+        ok_cls = self._make_mock_test_class()
+        ok_cls.return_value.run_async = AsyncMock(return_value=[vuln])
+        failing_cls = self._make_mock_test_class()
+        failing_cls.return_value.run_async = AsyncMock(side_effect=Exception("Connection refused"))
+        config = {
+            "target_url": "http://localhost:5000",
+            "headers": {},
+            "selected_tests": [ok_cls, failing_cls]
+        }
+        session = asyncio.run(scanner.run_scan_async(config))
+
+        assert session.end_time is not None
+        assert session.summary["total_tests"] == 1
+        assert session.summary["critical"] == 1
+
+    def test_run_scan_async_propagates_cancellation(self):
+        scanner = self.SecurityScanner()
+        ok_cls = self._make_mock_test_class()
+        ok_cls.return_value.run_async = AsyncMock(return_value=[])
+        cancelled_cls = self._make_mock_test_class()
+        cancelled_cls.return_value.run_async = AsyncMock(side_effect=asyncio.CancelledError())
+        config = {
+            "target_url": "http://localhost:5000",
+            "headers": {},
+            "selected_tests": [ok_cls, cancelled_cls]
+        }
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(scanner.run_scan_async(config))
+        assert scanner.session.end_time is None
+
     def test_save_results_creates_json(self, tmp_path, monkeypatch):
         monkeypatch.chdir(tmp_path)
         scanner = self.SecurityScanner()
@@ -248,6 +416,103 @@ class TestSecurityScanner:
             data = json.load(f)
         assert data["scan_id"] == "test-save"
 
+    def test_save_results_without_orjson(self, tmp_path, monkeypatch):
+        import core.scanner
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(core.scanner, "orjson", None)
+        scanner = self.SecurityScanner()
+        session = self.ScanSession("http://localhost:5000", scan_id="test-stdlib")
+        session.finalize()
+
+        filename = scanner.save_results(session, format="json")
+
+        with open(tmp_path / filename) as f:
+            data = json.load(f)
+        assert data["scan_id"] == "test-stdlib"
+
+
+# ─── Native async test overrides ──────────────────────────────────────────────
+
+def _fake_api(method, url, json=None):
+    """(status, body) from a tiny fake API with BOLA, SQL and NoSQL weaknesses."""
+    from urllib.parse import urlsplit, unquote
+    parts = urlsplit(url)
+    query = unquote(parts.query)
+    if method == "GET" and parts.path in ("/api/user/1", "/api/user/2"):
+        return 200, '{"id": "%s"}' % parts.path[-1]
+    if method == "GET" and query.startswith("q=") and "'" in query:
+        return 500, "SQL syntax error near '...'"
+    if method == "POST" and parts.path == "/api/login" and isinstance((json or {}).get("username"), dict):
+        return 200, '{"token": "t"}'
+    return 404, '{"error": "not found"}'
+
+
+class _StubSession:
+    """requests-style session answering from _fake_api."""
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        return self._respond("GET", url)
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        return self._respond("POST", url, json)
+
+    @staticmethod
+    def _respond(method, url, json=None):
+        status, text = _fake_api(method, url, json)
+        return MagicMock(status_code=status, text=text, headers={})
+
+
+class _StubAiohttpSession:
+    """aiohttp-style session answering from _fake_api; records peak in-flight requests."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+
+    def get(self, url, headers=None, params=None, **kwargs):
+        return self._Call(self, "GET", url)
+
+    def post(self, url, headers=None, json=None, **kwargs):
+        return self._Call(self, "POST", url, json)
+
+    class _Call:
+        def __init__(self, session, method, url, json=None):
+            self.session = session
+            self.status, self.body = _fake_api(method, url, json)
+            self.headers = {}
+
+        async def __aenter__(self):
+            self.session.in_flight += 1
+            self.session.peak = max(self.session.peak, self.session.in_flight)
+            await asyncio.sleep(0.001)
+            return self
+
+        async def __aexit__(self, *exc):
+            self.session.in_flight -= 1
+
+        async def text(self, errors="strict"):
+            return self.body
+
+
+class TestAsyncOverrides:
+    """The native run_async() overrides must agree with run() and respect max_concurrency."""
+
+    TARGET = "http://localhost:5000/api/search"
+
+    @pytest.mark.parametrize("test_name", ["BOLATest", "InjectionTest"])
+    def test_run_async_matches_run(self, test_name, monkeypatch):
+        import tests.vulnerability_tests as vt
+        monkeypatch.setattr(vt.time, "sleep", lambda seconds: None)
+        test_cls = getattr(vt, test_name)
+
+        expected = test_cls(session=_StubSession()).run(self.TARGET, {})
+        stub = _StubAiohttpSession()
+        actual = asyncio.run(test_cls().run_async(self.TARGET, stub, {}))
+
+        assert actual == expected
+        assert any(r["status"] == "VULNERABLE" for r in actual)
+        assert 1 < stub.peak <= test_cls.max_concurrency
+
 
 # ─── ALL_TESTS list validation ────────────────────────────────────────────────
 
@@ -3,36 +3,96 @@ OWASP API Security Top 10 (2023) - Vulnerability Test Implementations
 Each test class implements a specific OWASP API security check.
 """
 
+import asyncio
+import json
+import sys
+import aiohttp
 import requests
 import time
 from typing import Dict, List, Optional
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+
+from helpers import extract_base_url
+
+
+# ─── Result Vocabulary ───────────────────────────────────────────────────────
+# Interned so results built by the tests compare by identity in ScanSession
+
+STATUS_VULNERABLE = sys.intern("VULNERABLE")
+STATUS_PASSED = sys.intern("PASSED")
+STATUS_INFO = sys.intern("INFO")
+
+SEV_CRITICAL = sys.intern("CRITICAL")
+SEV_HIGH = sys.intern("HIGH")
+SEV_MEDIUM = sys.intern("MEDIUM")
+SEV_LOW = sys.intern("LOW")
+SEV_INFO = sys.intern("INFO")
 
 
 # ─── Base Class ──────────────────────────────────────────────────────────────
 
+class AsyncResponse:
+    """Snapshot of an aiohttp response, shaped like the parts of requests.Response the tests use."""
+
+    def __init__(self, status_code: int, text: str, headers):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+
 class BaseVulnerabilityTest:
     """Base class for all vulnerability tests."""
 
     name = "Base Test"
     category = "General"
-    severity = "INFO"
+    severity = SEV_INFO
     timeout = 10
+    max_concurrency = 5  # In-flight requests per test on the async path
+    use_response_cache = True  # Tests that must hit the network on every request opt out
+
+    def __init__(self, session: requests.Session = None):
+        # A shared session reuses pooled connections across tests; the
+        # requests module itself is the fallback with the same call API
+        self.http = session or requests
 
     def _get(self, url: str, headers: Dict = None, params: Dict = None) -> Optional[requests.Response]:
+        http = self.http if self.use_response_cache else getattr(self.http, "uncached", self.http)
         try:
-            return requests.get(url, headers=headers or {}, params=params,
+            return http.get(url, headers=headers or {}, params=params,
                                 timeout=self.timeout, allow_redirects=True)
         except requests.RequestException:
             return None
 
     def _post(self, url: str, headers: Dict = None, json: Dict = None) -> Optional[requests.Response]:
         try:
-            return requests.post(url, headers=headers or {}, json=json,
+            return self.http.post(url, headers=headers or {}, json=json,
                                  timeout=self.timeout, allow_redirects=True)
         except requests.RequestException:
             return None
 
+    async def _get_async(self, session: aiohttp.ClientSession, url: str,
+                         headers: Dict = None, params: Dict = None) -> Optional[AsyncResponse]:
+        try:
+            async with session.get(url, headers=headers or {}, params=params,
+                                   timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                   allow_redirects=True) as resp:
+                return AsyncResponse(resp.status, await resp.text(errors="replace"), resp.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
+    async def _post_async(self, session: aiohttp.ClientSession, url: str,
+                          headers: Dict = None, json: Dict = None) -> Optional[AsyncResponse]:
+        try:
+            async with session.post(url, headers=headers or {}, json=json,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                                    allow_redirects=True) as resp:
+                return AsyncResponse(resp.status, await resp.text(errors="replace"), resp.headers)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None
+
     def _result(self, status: str, url: str, method: str,
                 description: str, evidence: str, recommendation: str,
                 severity: str = None) -> Dict:
@@ -49,12 +109,20 @@ class BaseVulnerabilityTest:
         }
 
     def _base_url(self, target_url: str) -> str:
-        parsed = urlparse(target_url)
-        return f"{parsed.scheme}://{parsed.netloc}"
+        return extract_base_url(target_url)
 
     def run(self, target_url: str, headers: Dict = None) -> List[Dict]:
         raise NotImplementedError
 
+    async def run_async(self, target_url: str, session: aiohttp.ClientSession,
+                        headers: Dict = None) -> List[Dict]:
+        """
+        Async variant of run() driven by a shared aiohttp session.
+        Tests that issue many requests override this with native async I/O;
+        the default runs the blocking implementation in a worker thread.
+        """
+        return await asyncio.to_thread(self.run, target_url, headers)
+
 
 # ─── API1:2023 - Broken Object Level Authorization (BOLA) ────────────────────
 
@@ -66,7 +134,7 @@ class BOLATest(BaseVulnerabilityTest):
 
     name = "Broken Object Level Authorization"
     category = "API1:2023 - BOLA"
-    severity = "CRITICAL"
+    severity = SEV_CRITICAL
 
     # Common resource paths to test with sequential IDs
     RESOURCE_PATHS = [
@@ -78,72 +146,102 @@ class BOLATest(BaseVulnerabilityTest):
         "/api/v1/users/{id}",
     ]
 
+    OBJECT_IDS = [1, 2, 3]
+
     def run(self, target_url: str, headers: Dict = None) -> List[Dict]:
         results = []
         base = self._base_url(target_url)
         headers = headers or {}
 
-        tested_paths = []
-
         for path_template in self.RESOURCE_PATHS:
             # Try IDs 1 and 2 — if both return 200, BOLA is likely
             responses = {}
-            for obj_id in [1, 2, 3]:
+            for obj_id in self.OBJECT_IDS:
                 url = base + path_template.format(id=obj_id)
                 resp = self._get(url, headers)
                 if resp is not None:
                     responses[obj_id] = resp
                 time.sleep(0.2)
 
-            successful = {k: v for k, v in responses.items() if v.status_code == 200}
+            result = self._evaluate_path(base, path_template, responses)
+            if result:
+                results.append(result)
 
-            if len(successful) >= 2:
-                sample_url = base + path_template.format(id=1)
-                tested_paths.append(path_template)
-                results.append(self._result(
-                    status="VULNERABLE",
-                    url=sample_url,
-                    method="GET",
-                    description=(
-                        f"Endpoint {path_template} returns data for multiple object IDs "
-                        f"without validating ownership. IDs {list(successful.keys())} all returned HTTP 200."
-                    ),
-                    evidence=(
-                        f"GET {path_template.format(id=1)} → HTTP {list(successful.values())[0].status_code} | "
-                        f"GET {path_template.format(id=2)} → HTTP {list(successful.values())[1].status_code if len(successful) > 1 else 'N/A'}"
-                    ),
-                    recommendation=(
-                        "Implement object-level authorization checks on every endpoint that accesses a resource. "
-                        "Verify that the authenticated user owns or has permission to access the requested object ID. "
-                        "Never rely solely on the client-supplied ID."
-                    )
-                ))
-            elif responses:
-                # At least one path responded — report as INFO
-                first_url = base + path_template.format(id=1)
-                first_resp = list(responses.values())[0]
-                results.append(self._result(
-                    status="PASSED",
-                    url=first_url,
-                    method="GET",
-                    description=f"Endpoint {path_template} returned HTTP {first_resp.status_code} — access controls appear to be in place.",
-                    evidence=f"HTTP {first_resp.status_code}",
-                    recommendation="Continue enforcing object-level authorization on all resource endpoints.",
-                    severity="INFO"
-                ))
+        return results or [self._no_endpoints_result(base)]
 
-        if not tested_paths and not results:
-            results.append(self._result(
-                status="INFO",
-                url=base,
-                method="GET",
-                description="No common resource endpoints found to test BOLA. Test manually with known resource paths.",
-                evidence="No endpoints responded with HTTP 200",
-                recommendation="Implement object-level authorization on all resource endpoints.",
-                severity="INFO"
-            ))
+    async def run_async(self, target_url: str, session: aiohttp.ClientSession,
+                        headers: Dict = None) -> List[Dict]:
+        base = self._base_url(target_url)
+        headers = headers or {}
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        return results
+        async def fetch(obj_id, path_template):
+            async with semaphore:
+                return obj_id, await self._get_async(session, base + path_template.format(id=obj_id), headers)
+
+        # Enumerate every path/ID combination at once instead of one request at a time
+        fetched = await asyncio.gather(*[
+            asyncio.gather(*[fetch(obj_id, path_template) for obj_id in self.OBJECT_IDS])
+            for path_template in self.RESOURCE_PATHS
+        ])
+
+        results = []
+        for path_template, pairs in zip(self.RESOURCE_PATHS, fetched):
+            responses = {obj_id: resp for obj_id, resp in pairs if resp is not None}
+            result = self._evaluate_path(base, path_template, responses)
+            if result:
+                results.append(result)
+
+        return results or [self._no_endpoints_result(base)]
+
+    def _evaluate_path(self, base: str, path_template: str, responses: Dict) -> Optional[Dict]:
+        successful = {k: v for k, v in responses.items() if v.status_code == 200}
+
+        if len(successful) >= 2:
+            sample_url = base + path_template.format(id=1)
+            return self._result(
+                status=STATUS_VULNERABLE,
+                url=sample_url,
+                method="GET",
+                description=(
+                    f"Endpoint {path_template} returns data for multiple object IDs "
+                    f"without validating ownership. IDs {list(successful.keys())} all returned HTTP 200."
+                ),
+                evidence=(
+                    f"GET {path_template.format(id=1)} → HTTP {list(successful.values())[0].status_code} | "
+                    f"GET {path_template.format(id=2)} → HTTP {list(successful.values())[1].status_code if len(successful) > 1 else 'N/A'}"
+                ),
+                recommendation=(
+                    "Implement object-level authorization checks on every endpoint that accesses a resource. "
+                    "Verify that the authenticated user owns or has permission to access the requested object ID. "
+                    "Never rely solely on the client-supplied ID."
+                )
+            )
+        elif responses:
+            # At least one path responded — report as INFO
+            first_url = base + path_template.format(id=1)
+            first_resp = list(responses.values())[0]
+            return self._result(
+                status=STATUS_PASSED,
+                url=first_url,
+                method="GET",
+                description=f"Endpoint {path_template} returned HTTP {first_resp.status_code} — access controls appear to be in place.",
+                evidence=f"HTTP {first_resp.status_code}",
+                recommendation="Continue enforcing object-level authorization on all resource endpoints.",
+                severity=SEV_INFO
+            )
+        return None
+
+    def _no_endpoints_result(self, base: str) -> Dict:
+        return self._result(
+            status=STATUS_INFO,
+            url=base,
+            method="GET",
+            description="No common resource endpoints found to test BOLA. Test manually with known resource paths.",
+            evidence="No endpoints responded with HTTP 200",
+            recommendation="Implement object-level authorization on all resource endpoints.",
+            severity=SEV_INFO
+        )
 
 
 # ─── API2:2023 - Broken Authentication ───────────────────────────────────────
@@ -156,7 +254,7 @@ class BrokenAuthTest(BaseVulnerabilityTest):
 
     name = "Broken Authentication"
     category = "API2:2023 - Broken Authentication"
-    severity = "CRITICAL"
+    severity = SEV_CRITICAL
 
     PROTECTED_PATHS = [
         "/api/admin", "/api/admin/users", "/api/dashboard",
@@ -186,7 +284,7 @@ class BrokenAuthTest(BaseVulnerabilityTest):
             resp = self._get(url, no_auth_headers)
             if resp and resp.status_code == 200:
                 results.append(self._result(
-                    status="VULNERABLE",
+                    status=STATUS_VULNERABLE,
                     url=url,
                     method="GET",
                     description=f"Protected endpoint {path} is accessible without authentication.",
@@ -209,7 +307,7 @@ class BrokenAuthTest(BaseVulnerabilityTest):
                         has_token = any(k in data for k in ("token", "access_token", "jwt", "key"))
                         if has_token or "success" in str(data).lower():
                             results.append(self._result(
-                                status="VULNERABLE",
+                                status=STATUS_VULNERABLE,
                                 url=url,
                                 method="POST",
                                 description=f"Login endpoint accepts weak credentials: {username}/{password}",
@@ -225,13 +323,13 @@ class BrokenAuthTest(BaseVulnerabilityTest):
 
         if not results:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=base,
                 method="GET",
                 description="Authentication checks appear to be in place. No obvious weaknesses detected.",
                 evidence="Protected endpoints returned non-200 status without credentials.",
                 recommendation="Continue enforcing strong authentication. Implement MFA for sensitive operations.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -246,7 +344,7 @@ class ExcessiveDataExposureTest(BaseVulnerabilityTest):
 
     name = "Broken Object Property Level Authorization"
     category = "API3:2023 - Excessive Data Exposure / Mass Assignment"
-    severity = "HIGH"
+    severity = SEV_HIGH
 
     SENSITIVE_FIELDS = [
         "password", "password_hash", "secret", "private_key", "ssn",
@@ -276,7 +374,7 @@ class ExcessiveDataExposureTest(BaseVulnerabilityTest):
                     found = [f for f in self.SENSITIVE_FIELDS if f in body]
                     if found:
                         results.append(self._result(
-                            status="VULNERABLE",
+                            status=STATUS_VULNERABLE,
                             url=url,
                             method="GET",
                             description=f"Response contains potentially sensitive fields: {found}",
@@ -310,7 +408,7 @@ class ExcessiveDataExposureTest(BaseVulnerabilityTest):
                                 if f.lower() in body_str and str(payload.get(f, "")).lower() in body_str]
                     if accepted:
                         results.append(self._result(
-                            status="VULNERABLE",
+                            status=STATUS_VULNERABLE,
                             url=url,
                             method="POST",
                             description=f"API accepted mass assignment of privileged fields: {accepted}",
@@ -327,13 +425,13 @@ class ExcessiveDataExposureTest(BaseVulnerabilityTest):
 
         if not results:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=base,
                 method="GET/POST",
                 description="No excessive data exposure or mass assignment vulnerabilities detected.",
                 evidence="Sensitive fields not found in responses. Privileged POST fields were rejected.",
                 recommendation="Continue using response schemas and input allowlists.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -348,11 +446,14 @@ class RateLimitingTest(BaseVulnerabilityTest):
 
     name = "Unrestricted Resource Consumption"
     category = "API4:2023 - Unrestricted Resource Consumption"
-    severity = "MEDIUM"
+    severity = SEV_MEDIUM
 
     REQUEST_COUNT = 15
     THRESHOLD_MS = 100
 
+    # Repeats the same request on purpose, so responses must never be cached
+    use_response_cache = False
+
     def run(self, target_url: str, headers: Dict = None) -> List[Dict]:
         results = []
         headers = headers or {}
@@ -376,18 +477,18 @@ class RateLimitingTest(BaseVulnerabilityTest):
 
         if rate_limited:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=target_url,
                 method="GET",
                 description=f"Rate limiting is enforced. HTTP 429 received after {len(status_codes)} requests.",
                 evidence=f"HTTP 429 Too Many Requests received at request #{len(status_codes)}.",
                 recommendation="Good — rate limiting is active. Ensure limits are appropriately tuned.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
         elif len(status_codes) == self.REQUEST_COUNT and all(s == 200 for s in status_codes):
             avg_time = sum(response_times) / len(response_times)
             results.append(self._result(
-                status="VULNERABLE",
+                status=STATUS_VULNERABLE,
                 url=target_url,
                 method="GET",
                 description=f"No rate limiting detected. {self.REQUEST_COUNT} rapid requests all succeeded with HTTP 200.",
@@ -403,13 +504,13 @@ class RateLimitingTest(BaseVulnerabilityTest):
             ))
         else:
             results.append(self._result(
-                status="INFO",
+                status=STATUS_INFO,
                 url=target_url,
                 method="GET",
                 description=f"Inconclusive rate limit test. Status codes received: {set(status_codes)}",
                 evidence=f"Sent {len(status_codes)} requests. Status codes: {status_codes[:5]}...",
                 recommendation="Manually verify rate limiting is configured on all endpoints.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -425,7 +526,7 @@ class FunctionAuthTest(BaseVulnerabilityTest):
 
     name = "Broken Function Level Authorization"
     category = "API5:2023 - Broken Function Level Authorization"
-    severity = "HIGH"
+    severity = SEV_HIGH
 
     ADMIN_PATHS = [
         "/api/admin", "/api/admin/users", "/api/admin/config",
@@ -450,7 +551,7 @@ class FunctionAuthTest(BaseVulnerabilityTest):
             resp = self._get(url, low_priv_headers)
             if resp and resp.status_code == 200:
                 results.append(self._result(
-                    status="VULNERABLE",
+                    status=STATUS_VULNERABLE,
                     url=url,
                     method="GET",
                     description=f"Admin/privileged endpoint {path} is accessible without authorization.",
@@ -468,10 +569,10 @@ class FunctionAuthTest(BaseVulnerabilityTest):
         if resp and resp.status_code == 200:
             for method in ["DELETE", "PUT", "PATCH"]:
                 try:
-                    r = requests.request(method, target_url, headers=headers, timeout=self.timeout)
+                    r = self.http.request(method, target_url, headers=headers, timeout=self.timeout)
                     if r.status_code not in (405, 404, 403, 401):
                         results.append(self._result(
-                            status="VULNERABLE",
+                            status=STATUS_VULNERABLE,
                             url=target_url,
                             method=method,
                             description=f"Endpoint accepts unexpected HTTP method {method} (HTTP {r.status_code}).",
@@ -480,7 +581,7 @@ class FunctionAuthTest(BaseVulnerabilityTest):
                                 "Explicitly whitelist allowed HTTP methods on each endpoint. "
                                 "Return HTTP 405 Method Not Allowed for disallowed methods."
                             ),
-                            severity="MEDIUM"
+                            severity=SEV_MEDIUM
                         ))
                 except requests.RequestException:
                     pass
@@ -488,13 +589,13 @@ class FunctionAuthTest(BaseVulnerabilityTest):
 
         if not results:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=base,
                 method="GET",
                 description="Admin/privileged endpoints require proper authorization.",
                 evidence="All tested admin paths returned 401/403/404 without credentials.",
                 recommendation="Continue enforcing function-level authorization across all endpoints.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -509,7 +610,7 @@ class SSRFTest(BaseVulnerabilityTest):
 
     name = "Server Side Request Forgery"
     category = "API7:2023 - SSRF"
-    severity = "HIGH"
+    severity = SEV_HIGH
 
     SSRF_PAYLOADS = [
         "http://localhost/",
@@ -543,7 +644,7 @@ class SSRFTest(BaseVulnerabilityTest):
                     ]
                     if any(ind for ind in ssrf_indicators if isinstance(ind, str) and ind in body):
                         results.append(self._result(
-                            status="VULNERABLE",
+                            status=STATUS_VULNERABLE,
                             url=url,
                             method="GET",
                             description=f"Possible SSRF via parameter '{param}'. Server returned internal content.",
@@ -559,7 +660,7 @@ class SSRFTest(BaseVulnerabilityTest):
 
         if not results:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=target_url,
                 method="GET",
                 description="No SSRF vulnerabilities detected via common URL parameters.",
@@ -568,7 +669,7 @@ class SSRFTest(BaseVulnerabilityTest):
                     "Continue blocking requests to internal IP ranges. "
                     "Validate all user-supplied URLs against an allowlist."
                 ),
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -584,7 +685,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
 
     name = "Security Misconfiguration"
     category = "API8:2023 - Security Misconfiguration"
-    severity = "MEDIUM"
+    severity = SEV_MEDIUM
 
     SECURITY_HEADERS = {
         "X-Content-Type-Options": "nosniff",
@@ -601,13 +702,13 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
         resp = self._get(target_url, headers)
         if not resp:
             return [self._result(
-                status="INFO",
+                status=STATUS_INFO,
                 url=target_url,
                 method="GET",
                 description="Could not connect to target to check security configuration.",
                 evidence="Connection failed or timed out.",
                 recommendation="Ensure the target API is accessible.",
-                severity="INFO"
+                severity=SEV_INFO
             )]
 
         # 1. Check missing security headers
@@ -618,7 +719,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
 
         if missing_headers:
             results.append(self._result(
-                status="VULNERABLE",
+                status=STATUS_VULNERABLE,
                 url=target_url,
                 method="GET",
                 description=f"Missing security headers: {missing_headers}",
@@ -630,14 +731,14 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
                     "Strict-Transport-Security (HSTS), "
                     "Content-Security-Policy."
                 ),
-                severity="MEDIUM"
+                severity=SEV_MEDIUM
             ))
 
         # 2. Check for overly permissive CORS
         cors_origin = resp.headers.get("Access-Control-Allow-Origin", "")
         if cors_origin == "*":
             results.append(self._result(
-                status="VULNERABLE",
+                status=STATUS_VULNERABLE,
                 url=target_url,
                 method="GET",
                 description="CORS is configured to allow all origins (Access-Control-Allow-Origin: *).",
@@ -646,7 +747,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
                     "Restrict CORS to specific trusted origins. "
                     "Never use wildcard '*' for APIs handling authenticated requests."
                 ),
-                severity="HIGH"
+                severity=SEV_HIGH
             ))
 
         # 3. Check for debug/stack trace information in error responses
@@ -659,7 +760,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
             found_debug = [ind for ind in debug_indicators if ind in body]
             if found_debug:
                 results.append(self._result(
-                    status="VULNERABLE",
+                    status=STATUS_VULNERABLE,
                     url=error_url,
                     method="GET",
                     description="API exposes debug/stack trace information in error responses.",
@@ -669,7 +770,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
                         "Return generic error messages to clients. "
                         "Log detailed errors server-side only."
                     ),
-                    severity="MEDIUM"
+                    severity=SEV_MEDIUM
                 ))
 
         # 4. Check for server version disclosure
@@ -677,7 +778,7 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
         x_powered = resp.headers.get("X-Powered-By", "")
         if any(v for v in [server_header, x_powered] if v):
             results.append(self._result(
-                status="VULNERABLE",
+                status=STATUS_VULNERABLE,
                 url=target_url,
                 method="GET",
                 description=f"Server version information disclosed in response headers.",
@@ -686,18 +787,18 @@ class SecurityMisconfigTest(BaseVulnerabilityTest):
                     "Remove or obscure Server and X-Powered-By headers. "
                     "Version disclosure helps attackers target known vulnerabilities."
                 ),
-                severity="LOW"
+                severity=SEV_LOW
             ))
 
         if not results:
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=target_url,
                 method="GET",
                 description="Security headers and configuration appear to be properly set.",
                 evidence="All checked security headers present. No debug information exposed.",
                 recommendation="Continue regular security configuration audits.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -713,7 +814,7 @@ class InventoryTest(BaseVulnerabilityTest):
 
     name = "Improper Inventory Management"
     category = "API9:2023 - Improper Inventory Management"
-    severity = "MEDIUM"
+    severity = SEV_MEDIUM
 
     DOC_PATHS = [
         "/swagger", "/swagger-ui", "/swagger-ui.html",
@@ -745,7 +846,7 @@ class InventoryTest(BaseVulnerabilityTest):
             resp = self._get(url, headers)
             if resp and resp.status_code == 200:
                 results.append(self._result(
-                    status="VULNERABLE",
+                    status=STATUS_VULNERABLE,
                     url=url,
                     method="GET",
                     description=f"API documentation publicly accessible at {path}.",
@@ -754,7 +855,7 @@ class InventoryTest(BaseVulnerabilityTest):
                         "Restrict API documentation to internal networks or authenticated users. "
                         "Do not expose Swagger/OpenAPI docs publicly in production."
                     ),
-                    severity="LOW"
+                    severity=SEV_LOW
                 ))
             time.sleep(0.1)
 
@@ -764,7 +865,7 @@ class InventoryTest(BaseVulnerabilityTest):
             resp = self._get(url, headers)
             if resp and resp.status_code == 200:
                 results.append(self._result(
-                    status="VULNERABLE",
+                    status=STATUS_VULNERABLE,
                     url=url,
                     method="GET",
                     description=f"Old or alternative API version accessible at {path}.",
@@ -773,7 +874,7 @@ class InventoryTest(BaseVulnerabilityTest):
                         "Decommission old API versions. "
                         "Redirect requests to old versions to the current version or return 410 Gone."
                     ),
-                    severity="MEDIUM"
+                    severity=SEV_MEDIUM
                 ))
             time.sleep(0.1)
 
@@ -788,7 +889,7 @@ class InventoryTest(BaseVulnerabilityTest):
                                       "database", "env", "environment"])
                 if sensitive_info:
                     results.append(self._result(
-                        status="VULNERABLE",
+                        status=STATUS_VULNERABLE,
                         url=url,
                         method="GET",
                         description=f"Debug/health endpoint at {path} exposes sensitive configuration.",
@@ -797,29 +898,29 @@ class InventoryTest(BaseVulnerabilityTest):
                             "Remove sensitive data from health/debug endpoints. "
                             "Restrict these endpoints to internal networks only."
                         ),
-                        severity="HIGH"
+                        severity=SEV_HIGH
                     ))
                 else:
                     results.append(self._result(
-                        status="INFO",
+                        status=STATUS_INFO,
                         url=url,
                         method="GET",
                         description=f"Health/status endpoint publicly accessible at {path}.",
                         evidence=f"GET {url} → HTTP 200",
                         recommendation="Review whether this endpoint should be publicly accessible.",
-                        severity="INFO"
+                        severity=SEV_INFO
                     ))
             time.sleep(0.1)
 
-        if not any(r["status"] == "VULNERABLE" for r in results):
+        if not any(r["status"] == STATUS_VULNERABLE for r in results):
             results.append(self._result(
-                status="PASSED",
+                status=STATUS_PASSED,
                 url=base,
                 method="GET",
                 description="No exposed documentation, old API versions, or sensitive debug endpoints found.",
                 evidence="All checked paths returned 404/401/403.",
                 recommendation="Continue maintaining an inventory of all API endpoints and versions.",
-                severity="INFO"
+                severity=SEV_INFO
             ))
 
         return results
@@ -834,7 +935,7 @@ class InjectionTest(BaseVulnerabilityTest):
 
     name = "Injection Vulnerabilities"
     category = "API10:2023 - Injection"
-    severity = "CRITICAL"
+    severity = SEV_CRITICAL
 
     SQL_PAYLOADS = [
         "' OR '1'='1",
@@ -860,6 +961,8 @@ class InjectionTest(BaseVulnerabilityTest):
         "db error", "database error", "query failed",
     ]
 
+    LOGIN_PATHS = ["/api/login", "/api/auth", "/api/v1/login", "/login"]
+
     def run(self, target_url: str, headers: Dict = None) -> List[Dict]:
         results = []
         headers = headers or {}
@@ -869,73 +972,124 @@ class InjectionTest(BaseVulnerabilityTest):
             for payload in self.SQL_PAYLOADS:
                 url = f"{target_url}?{param}={requests.utils.quote(payload)}"
                 resp = self._get(url, headers)
-                if resp:
-                    body = resp.text.lower()
-                    found_errors = [p for p in self.SQL_ERROR_PATTERNS if p in body]
-                    if found_errors:
-                        results.append(self._result(
-                            status="VULNERABLE",
-                            url=url,
-                            method="GET",
-                            description=f"SQL injection detected via parameter '{param}'. Database error exposed.",
-                            evidence=(
-                                f"Payload: {payload}\n"
-                                f"HTTP {resp.status_code} — Error patterns found: {found_errors}"
-                            ),
-                            recommendation=(
-                                "Use parameterized queries or prepared statements. "
-                                "Never concatenate user input into SQL queries. "
-                                "Apply input validation and sanitization. "
-                                "Use an ORM and enable query logging to detect attacks."
-                            )
-                        ))
-                        break  # One finding per param is enough
+                result = self._check_sql_response(param, payload, url, resp)
+                if result:
+                    results.append(result)
+                    break  # One finding per param is enough
                 time.sleep(0.15)
 
         # 2. NoSQL Injection via POST body
-        login_paths = ["/api/login", "/api/auth", "/api/v1/login", "/login"]
         base = self._base_url(target_url)
-        for path in login_paths:
+        for path in self.LOGIN_PATHS:
             url = base + path
             for payload in self.NOSQL_PAYLOADS:
                 try:
-                    import json as json_lib
-                    body = json_lib.loads(payload)
+                    body = json.loads(payload)
                     resp = self._post(url, headers, json={"username": body, "password": body})
-                    if resp and resp.status_code == 200:
-                        resp_body = resp.text.lower()
-                        if any(k in resp_body for k in ["token", "success", "welcome", "logged"]):
-                            results.append(self._result(
-                                status="VULNERABLE",
-                                url=url,
-                                method="POST",
-                                description=f"Possible NoSQL injection — authentication bypassed with operator payload.",
-                                evidence=f"POST with payload {payload} → HTTP 200 with success response.",
-                                recommendation=(
-                                    "Validate and sanitize all input types including JSON objects. "
-                                    "Use schema validation to reject unexpected operators ($gt, $ne, $where). "
-                                    "Avoid passing raw user input to database queries."
-                                )
-                            ))
+                    result = self._check_nosql_response(url, payload, resp)
+                    if result:
+                        results.append(result)
                 except Exception:
                     pass
                 time.sleep(0.2)
 
-        if not results:
-            results.append(self._result(
-                status="PASSED",
-                url=target_url,
-                method="GET/POST",
-                description="No injection vulnerabilities detected via common payloads.",
-                evidence="SQL error patterns not found. NoSQL operators did not bypass authentication.",
-                recommendation=(
-                    "Continue using parameterized queries and input validation. "
-                    "Implement a WAF for additional injection protection."
-                ),
-                severity="INFO"
-            ))
+        return results or [self._passed_result(target_url)]
 
-        return results
+    async def run_async(self, target_url: str, session: aiohttp.ClientSession,
+                        headers: Dict = None) -> List[Dict]:
+        results = []
+        headers = headers or {}
+        base = self._base_url(target_url)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def probe_sql(param, payload):
+            url = f"{target_url}?{param}={requests.utils.quote(payload)}"
+            async with semaphore:
+                resp = await self._get_async(session, url, headers)
+            return self._check_sql_response(param, payload, url, resp)
+
+        async def probe_nosql(url, payload):
+            body = json.loads(payload)
+            async with semaphore:
+                resp = await self._post_async(session, url, headers, json={"username": body, "password": body})
+            return self._check_nosql_response(url, payload, resp)
+
+        # 1. SQL Injection via query parameters — all payloads in flight at once
+        sql_checks = await asyncio.gather(*[
+            asyncio.gather(*[probe_sql(param, payload) for payload in self.SQL_PAYLOADS])
+            for param in self.SEARCH_PARAMS
+        ])
+        for param_results in sql_checks:
+            # One finding per param is enough
+            finding = next((r for r in param_results if r), None)
+            if finding:
+                results.append(finding)
+
+        # 2. NoSQL Injection via POST body
+        nosql_checks = await asyncio.gather(*[
+            probe_nosql(base + path, payload)
+            for path in self.LOGIN_PATHS
+            for payload in self.NOSQL_PAYLOADS
+        ], return_exceptions=True)
+        results.extend(r for r in nosql_checks if isinstance(r, dict))
+
+        return results or [self._passed_result(target_url)]
+
+    def _check_sql_response(self, param: str, payload: str, url: str, resp) -> Optional[Dict]:
+        if not resp:
+            return None
+        body = resp.text.lower()
+        found_errors = [p for p in self.SQL_ERROR_PATTERNS if p in body]
+        if not found_errors:
+            return None
+        return self._result(
+            status=STATUS_VULNERABLE,
+            url=url,
+            method="GET",
+            description=f"SQL injection detected via parameter '{param}'. Database error exposed.",
+            evidence=(
+                f"Payload: {payload}\n"
+                f"HTTP {resp.status_code} — Error patterns found: {found_errors}"
+            ),
+            recommendation=(
+                "Use parameterized queries or prepared statements. "
+                "Never concatenate user input into SQL queries. "
+                "Apply input validation and sanitization. "
+                "Use an ORM and enable query logging to detect attacks."
+            )
+        )
+
+    def _check_nosql_response(self, url: str, payload: str, resp) -> Optional[Dict]:
+        if resp and resp.status_code == 200:
+            resp_body = resp.text.lower()
+            if any(k in resp_body for k in ["token", "success", "welcome", "logged"]):
+                return self._result(
+                    status=STATUS_VULNERABLE,
+                    url=url,
+                    method="POST",
+                    description=f"Possible NoSQL injection — authentication bypassed with operator payload.",
+                    evidence=f"POST with payload {payload} → HTTP 200 with success response.",
+                    recommendation=(
+                        "Validate and sanitize all input types including JSON objects. "
+                        "Use schema validation to reject unexpected operators ($gt, $ne, $where). "
+                        "Avoid passing raw user input to database queries."
+                    )
+                )
+        return None
+
+    def _passed_result(self, target_url: str) -> Dict:
+        return self._result(
+            status=STATUS_PASSED,
+            url=target_url,
+            method="GET/POST",
+            description="No injection vulnerabilities detected via common payloads.",
+            evidence="SQL error patterns not found. NoSQL operators did not bypass authentication.",
+            recommendation=(
+                "Continue using parameterized queries and input validation. "
+                "Implement a WAF for additional injection protection."
+            ),
+            severity=SEV_INFO
+        )
 
 
 # ─── Test Registry ────────────────────────────────────────────────────────────